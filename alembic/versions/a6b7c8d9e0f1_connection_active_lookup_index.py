@@ -0,0 +1,46 @@
+"""index active connections by (user_id, provider, created_at desc)
+
+Revision ID: a6b7c8d9e0f1
+Revises: f5a6b7c8d9e0
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "a6b7c8d9e0f1"
+down_revision: Union[str, None] = "f5a6b7c8d9e0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Matches ConnectionService's hot lookup (user_id = ? AND provider = ?
+# AND revoked_at IS NULL ORDER BY created_at DESC LIMIT 1), so it becomes
+# a single index seek with no sort node. Built CONCURRENTLY, see
+# f5a6b7c8d9e0.
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_connections_user_provider_created_active",
+            "connections",
+            ["user_id", "provider", sa.text("created_at DESC")],
+            unique=False,
+            postgresql_where=sa.text("revoked_at IS NULL"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_connections_user_provider_created_active",
+            table_name="connections",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
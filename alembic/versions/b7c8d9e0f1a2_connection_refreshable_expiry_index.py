@@ -0,0 +1,46 @@
+"""index refreshable connections by expires_at
+
+Revision ID: b7c8d9e0f1a2
+Revises: a6b7c8d9e0f1
+Create Date: 2026-10-15 00:00:01.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "b7c8d9e0f1a2"
+down_revision: Union[str, None] = "a6b7c8d9e0f1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# TokenRefreshService filters on exactly this predicate and ranges over
+# expires_at (expiring-soon scan plus min(expires_at)), so both become
+# index range scans. now() can't go in a partial index predicate, hence
+# the range column. Built CONCURRENTLY, see f5a6b7c8d9e0.
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_connections_refreshable_expires_at",
+            "connections",
+            ["expires_at"],
+            unique=False,
+            postgresql_where=sa.text("revoked_at IS NULL AND refresh_token IS NOT NULL"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_connections_refreshable_expires_at",
+            table_name="connections",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
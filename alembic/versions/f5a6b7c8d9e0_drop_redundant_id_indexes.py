@@ -0,0 +1,58 @@
+"""drop redundant id indexes on subscriptions and transactions
+
+Revision ID: f5a6b7c8d9e0
+Revises: e4f5a6b7c8d9
+Create Date: 2026-06-02 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "f5a6b7c8d9e0"
+down_revision: Union[str, None] = "e4f5a6b7c8d9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# CONCURRENTLY can't run inside a transaction, so every index change here
+# goes through an autocommit block; IF [NOT] EXISTS makes a retry after a
+# half-finished run safe. Copy this pattern for indexes on live tables.
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        # The primary key already indexes `id`; these only cost writes.
+        op.drop_index(
+            "ix_subscriptions_id",
+            table_name="subscriptions",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_transactions_id",
+            table_name="transactions",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_transactions_id",
+            "transactions",
+            ["id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_subscriptions_id",
+            "subscriptions",
+            ["id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
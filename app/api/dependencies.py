@@ -49,8 +49,9 @@ async def get_current_user(
         auth_header = request.headers.get("Authorization")
         token: str | None = None
 
-        if auth_header and auth_header.lower().startswith("bearer "):
-            token = auth_header.split(" ", 1)[1].strip()
+        # Only the 7-char scheme prefix is case-folded, not the whole JWT
+        if auth_header and auth_header[:7].lower() == "bearer ":
+            token = auth_header[7:].strip()
         else:
             token = request.cookies.get("access_token")
 
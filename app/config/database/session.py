@@ -42,9 +42,10 @@ Base = declarative_base()
 async def get_db():
     """
     Dependency to get the database session.
+
+    The session context manager closes it; code outside a request should
+    use ``async with SessionLocal() as db`` directly, not drive this
+    generator.
     """
     async with SessionLocal() as db:
-        try:
-            yield db
-        finally:
-            await db.close()
+        yield db
@@ -1,8 +1,7 @@
-import secrets
-from urllib.parse import urlencode
-
 import httpx
+import orjson
 
+from app.config.http_client import authorization_url, get_oauth_client
 from app.config.logger_config import get_logger
 from app.config.settings import get_settings
 
@@ -27,31 +26,29 @@ class FacebookAuth:
 
     def get_authorization_url(self) -> str:
         """Generate the Facebook OAuth dialog URL."""
-        state = secrets.token_urlsafe(32)
-        params = {
-            "client_id": self.app_id,
-            "redirect_uri": self.redirect_uri,
-            "response_type": "code",
-            "scope": ",".join(self.scopes),
-            "state": state,
-        }
-        return f"https://www.facebook.com/{GRAPH_API_VERSION}/dialog/oauth?{urlencode(params)}"
+        return authorization_url(
+            f"https://www.facebook.com/{GRAPH_API_VERSION}/dialog/oauth",
+            client_id=self.app_id,
+            redirect_uri=self.redirect_uri,
+            response_type="code",
+            scope=",".join(self.scopes),
+        )
 
     async def exchange_code_for_token(self, code: str) -> dict:
         """Exchange authorization code for a short-lived access token."""
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(
-                    f"{GRAPH_BASE}/oauth/access_token",
-                    params={
-                        "client_id": self.app_id,
-                        "client_secret": self.app_secret,
-                        "redirect_uri": self.redirect_uri,
-                        "code": code,
-                    },
-                )
-                response.raise_for_status()
-                return response.json()
+            client = get_oauth_client()
+            response = await client.get(
+                f"{GRAPH_BASE}/oauth/access_token",
+                params={
+                    "client_id": self.app_id,
+                    "client_secret": self.app_secret,
+                    "redirect_uri": self.redirect_uri,
+                    "code": code,
+                },
+            )
+            response.raise_for_status()
+            return orjson.loads(response.content)
         except httpx.HTTPStatusError as e:
             logger.error(f"Token exchange failed: {e.response.status_code} - {e.response.text}")
             raise
@@ -66,20 +63,20 @@ class FacebookAuth:
             dict with access_token, token_type, expires_in
         """
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(
-                    f"{GRAPH_BASE}/oauth/access_token",
-                    params={
-                        "grant_type": "fb_exchange_token",
-                        "client_id": self.app_id,
-                        "client_secret": self.app_secret,
-                        "fb_exchange_token": short_lived_token,
-                    },
-                )
-                response.raise_for_status()
-                token_data = response.json()
-                logger.info("[FacebookAuth] Exchanged for long-lived token")
-                return token_data
+            client = get_oauth_client()
+            response = await client.get(
+                f"{GRAPH_BASE}/oauth/access_token",
+                params={
+                    "grant_type": "fb_exchange_token",
+                    "client_id": self.app_id,
+                    "client_secret": self.app_secret,
+                    "fb_exchange_token": short_lived_token,
+                },
+            )
+            response.raise_for_status()
+            token_data = orjson.loads(response.content)
+            logger.info("[FacebookAuth] Exchanged for long-lived token")
+            return token_data
         except httpx.HTTPStatusError as e:
             logger.error(f"Long-lived token exchange failed: {e.response.status_code} - {e.response.text}")
             raise
@@ -98,20 +95,20 @@ class FacebookAuth:
             dict with access_token, token_type, expires_in
         """
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(
-                    f"{GRAPH_BASE}/oauth/access_token",
-                    params={
-                        "grant_type": "fb_exchange_token",
-                        "client_id": self.app_id,
-                        "client_secret": self.app_secret,
-                        "fb_exchange_token": long_lived_token,
-                    },
-                )
-                response.raise_for_status()
-                token_data = response.json()
-                logger.info("[FacebookAuth] Token refreshed successfully")
-                return token_data
+            client = get_oauth_client()
+            response = await client.get(
+                f"{GRAPH_BASE}/oauth/access_token",
+                params={
+                    "grant_type": "fb_exchange_token",
+                    "client_id": self.app_id,
+                    "client_secret": self.app_secret,
+                    "fb_exchange_token": long_lived_token,
+                },
+            )
+            response.raise_for_status()
+            token_data = orjson.loads(response.content)
+            logger.info("[FacebookAuth] Token refreshed successfully")
+            return token_data
         except httpx.HTTPStatusError as e:
             logger.error(f"Token refresh failed: {e.response.status_code} - {e.response.text}")
             raise
@@ -126,17 +123,17 @@ class FacebookAuth:
             list of dicts with id, name, access_token (page token)
         """
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(
-                    f"{GRAPH_BASE}/me/accounts",
-                    params={
-                        "access_token": access_token,
-                        "fields": "id,name,access_token",
-                    },
-                )
-                response.raise_for_status()
-                data = response.json()
-                return data.get("data", [])
+            client = get_oauth_client()
+            response = await client.get(
+                f"{GRAPH_BASE}/me/accounts",
+                params={
+                    "access_token": access_token,
+                    "fields": "id,name,access_token",
+                },
+            )
+            response.raise_for_status()
+            data = orjson.loads(response.content)
+            return data.get("data", [])
         except Exception as e:
             logger.error(f"Failed to fetch user pages: {e}")
             raise
@@ -173,28 +170,28 @@ class FacebookAuth:
             if target_id == "me":
                 params["privacy"] = f'{{"value":"{privacy}"}}'
 
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    f"{GRAPH_BASE}/{target_id}/live_videos",
-                    params=params,
-                )
-                response.raise_for_status()
-                data = response.json()
+            client = get_oauth_client()
+            response = await client.post(
+                f"{GRAPH_BASE}/{target_id}/live_videos",
+                params=params,
+            )
+            response.raise_for_status()
+            data = orjson.loads(response.content)
 
-                live_video_id = data["id"]
-                stream_url = data.get("secure_stream_url") or data.get("stream_url", "")
+            live_video_id = data["id"]
+            stream_url = data.get("secure_stream_url") or data.get("stream_url", "")
 
-                # Parse stream_url into rtmp_url + stream_key
-                rtmp_url, stream_key = self._parse_stream_url(stream_url)
+            # Parse stream_url into rtmp_url + stream_key
+            rtmp_url, stream_key = self._parse_stream_url(stream_url)
 
-                logger.info(f"[FacebookAuth] LiveVideo created: {live_video_id} on {target_id}")
+            logger.info(f"[FacebookAuth] LiveVideo created: {live_video_id} on {target_id}")
 
-                return {
-                    "live_video_id": live_video_id,
-                    "stream_url": stream_url,
-                    "rtmp_url": rtmp_url,
-                    "stream_key": stream_key,
-                }
+            return {
+                "live_video_id": live_video_id,
+                "stream_url": stream_url,
+                "rtmp_url": rtmp_url,
+                "stream_key": stream_key,
+            }
         except httpx.HTTPStatusError as e:
             logger.error(f"Create live video failed: {e.response.status_code} - {e.response.text}")
             raise
@@ -208,17 +205,17 @@ class FacebookAuth:
         Calls POST /{live_video_id}?end_live_video=true
         """
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    f"{GRAPH_BASE}/{live_video_id}",
-                    params={
-                        "end_live_video": "true",
-                        "access_token": access_token,
-                    },
-                )
-                response.raise_for_status()
-                logger.info(f"[FacebookAuth] LiveVideo ended: {live_video_id}")
-                return response.json()
+            client = get_oauth_client()
+            response = await client.post(
+                f"{GRAPH_BASE}/{live_video_id}",
+                params={
+                    "end_live_video": "true",
+                    "access_token": access_token,
+                },
+            )
+            response.raise_for_status()
+            logger.info(f"[FacebookAuth] LiveVideo ended: {live_video_id}")
+            return orjson.loads(response.content)
         except Exception as e:
             logger.error(f"End live video failed: {e}")
             raise
@@ -230,16 +227,16 @@ class FacebookAuth:
             dict with id, status, video (associated video post)
         """
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(
-                    f"{GRAPH_BASE}/{live_video_id}",
-                    params={
-                        "fields": "id,status,title,video,permalink_url",
-                        "access_token": access_token,
-                    },
-                )
-                response.raise_for_status()
-                return response.json()
+            client = get_oauth_client()
+            response = await client.get(
+                f"{GRAPH_BASE}/{live_video_id}",
+                params={
+                    "fields": "id,status,title,video,permalink_url",
+                    "access_token": access_token,
+                },
+            )
+            response.raise_for_status()
+            return orjson.loads(response.content)
         except Exception as e:
             logger.error(f"Get live video status failed: {e}")
             raise
@@ -0,0 +1,94 @@
+"""Shared outbound HTTP client for third-party OAuth / Graph APIs.
+
+One keep-alive pool per worker event loop, so token exchanges and
+refreshes against id.twitch.tv, oauth2.googleapis.com and
+graph.facebook.com reuse their TCP/TLS connections instead of handshaking
+on every call. The pool speaks HTTP/2 where the provider offers it, so
+concurrent calls to one host share a single multiplexed connection.
+Closed from the app lifespan on shutdown.
+"""
+
+import asyncio
+import secrets
+import ssl
+import weakref
+from functools import lru_cache
+from urllib.parse import urlencode
+
+import httpx
+
+# One client per event loop: an AsyncClient's pooled connections belong to
+# the loop that opened them, and reusing it from another loop (a second
+# asyncio.run, a test runner's fresh loop) fails with "Event loop is closed".
+_oauth_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+@lru_cache(maxsize=1)
+def public_ssl_context() -> ssl.SSLContext:
+    """Create SSL context for public APIs with system certificates.
+
+    Built once per process: the CA bundle lookup and PEM parse are the
+    expensive part, and an SSLContext is safe to share across clients.
+    """
+    ssl_context = ssl.create_default_context()
+
+    # Try different system certificate locations
+    cert_paths = [
+        "/etc/ssl/certs/ca-certificates.crt",  # Debian/Ubuntu
+        "/etc/pki/tls/certs/ca-bundle.crt",  # CentOS/RHEL
+        "/etc/ssl/cert.pem",  # macOS
+    ]
+
+    for cert_path in cert_paths:
+        try:
+            ssl_context.load_verify_locations(cert_path)
+            return ssl_context
+        except FileNotFoundError:
+            continue
+
+    # Fallback to certifi if available
+    try:
+        import certifi
+
+        ssl_context.load_verify_locations(certifi.where())
+        return ssl_context
+    except ImportError:
+        pass
+
+    # Last resort: use default context (might fail)
+    return ssl.create_default_context()
+
+
+def authorization_url(endpoint: str, **params: str) -> str:
+    """Build an OAuth authorize URL with a fresh `state`.
+
+    Only `state` changes between login clicks, so the encoded static part
+    is cached per endpoint + params.
+    """
+    return _authorization_url_prefix(endpoint, tuple(params.items())) + secrets.token_urlsafe(32)
+
+
+@lru_cache(maxsize=16)
+def _authorization_url_prefix(endpoint: str, params: tuple[tuple[str, str], ...]) -> str:
+    return f"{endpoint}?{urlencode(params)}&state="
+
+
+def get_oauth_client() -> httpx.AsyncClient:
+    """Return the running loop's shared client, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    client = _oauth_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=30.0,
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            verify=public_ssl_context(),
+        )
+        _oauth_clients[loop] = client
+    return client
+
+
+async def close_oauth_client() -> None:
+    client = _oauth_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
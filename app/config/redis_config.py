@@ -1,19 +1,28 @@
 from __future__ import annotations
 
+import asyncio
 import builtins
+import contextlib
+import fnmatch
+import glob
 import hashlib
 import importlib
-import json
-from collections.abc import Callable, Coroutine
+import inspect
+import random
+from collections.abc import Callable, Coroutine, Sequence
 from datetime import date, datetime
 from enum import Enum
 from functools import wraps
 from typing import Any, ParamSpec, TypeVar, cast
 from uuid import UUID
 
-import redis.asyncio as redis
+import lz4.frame
+import orjson
+from cachetools import TLRUCache
 from pydantic import BaseModel
-from redis.asyncio import Redis
+from redis.asyncio import ConnectionPool, Redis
+from redis.commands.core import AsyncScript
+from redis.utils import HIREDIS_AVAILABLE
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config.logger_config import get_logger
@@ -32,6 +41,41 @@ _VALUE_TAG = "__v"
 # that originally made `pickle.loads` unsafe.
 _ALLOWED_DESERIALIZE_PREFIXES: tuple[str, ...] = ("app.",)
 
+# SCAN COUNT hint and UNLINK batch size for delete_pattern.
+_SCAN_BATCH = 500
+# UNLINK batches queued per pipeline round trip in delete_pattern.
+_PIPELINE_FLUSH_BATCHES = 10
+# Members per SADD/SREM command when a caller passes a large set.
+_SET_CHUNK = 1000
+# Deferred decorator SETs: queue bound, SETEXs per pipeline, and how long
+# the flusher waits after the first item to let a batch build up.
+_SET_QUEUE_MAX = 1024
+_SET_FLUSH_MAX = 64
+_SET_FLUSH_INTERVAL = 0.005
+
+# Client-tracking reconnects back off exponentially (with jitter) between
+# these bounds, so workers don't hammer a Redis that is failing over.
+_TRACKING_RETRY_MIN = 0.5
+_TRACKING_RETRY_MAX = 30.0
+# Channel Redis publishes redirected invalidations on for RESP2 clients
+_INVALIDATE_CHANNEL = "__redis__:invalidate"
+
+# One SCAN step plus the UNLINK of its matches, run server-side: the
+# client only round-trips the cursor. Deliberately one step per call
+# rather than the whole cursor loop, which would block Redis for a full
+# keyspace walk just like KEYS does.
+_DELETE_PATTERN_STEP_LUA = """
+local r = redis.call('SCAN', ARGV[1], 'MATCH', KEYS[1], 'COUNT', ARGV[2])
+if #r[2] > 0 then
+    redis.call('UNLINK', unpack(r[2]))
+end
+return r[1]
+"""
+
+
+def _chunks(values: tuple[str, ...], size: int) -> list[tuple[str, ...]]:
+    return [values[i : i + size] for i in range(0, len(values), size)]
+
 
 def _to_json_safe(obj: Any) -> Any:
     """Recursively convert obj to a JSON-safe representation with type tags."""
@@ -144,24 +188,239 @@ def _from_json_safe(obj: Any) -> Any:
     return obj
 
 
+# orjson is a drop-in for the stdlib codec on this tagged representation —
+# the wire format is plain JSON either way, so entries written before the
+# switch still decode. OPT_NON_STR_KEYS keeps the stdlib behaviour of
+# stringifying int/UUID dict keys instead of raising.
+_ORJSON_OPTS = orjson.OPT_NON_STR_KEYS
+
+
+# Bare str/bytes/int values skip the JSON walk and are stored behind a
+# one-byte tag. None of these can start a JSON document, so untagged
+# payloads (including entries written before the tags existed) still
+# decode as JSON.
+_RAW_STR = b"S"
+_RAW_BYTES = b"B"
+_RAW_INT = b"I"
+_INT64_MIN, _INT64_MAX = -(2**63), 2**63 - 1
+# Payloads above this size are LZ4-framed behind their own tag; list
+# endpoints cache enough DTOs for Redis memory and egress to matter.
+_LZ4 = b"Z"
+_COMPRESS_MIN_BYTES = 1024
+
+
+def _encode(value: Any) -> bytes:
+    # Exact type checks: bool, IntEnum and StrEnum must keep their tags.
+    t = type(value)
+    if t is str:
+        return _RAW_STR + value.encode()
+    if t is bytes or t is bytearray:
+        return _RAW_BYTES + bytes(value)
+    if t is int and _INT64_MIN <= value <= _INT64_MAX:
+        return _RAW_INT + value.to_bytes(8, "little", signed=True)
+    return orjson.dumps(_to_json_safe(value), option=_ORJSON_OPTS)
+
+
 def _serialize(value: Any) -> bytes:
-    return json.dumps(_to_json_safe(value)).encode("utf-8")
+    raw = _encode(value)
+    if len(raw) > _COMPRESS_MIN_BYTES:
+        packed = _LZ4 + lz4.frame.compress(raw)
+        if len(packed) < len(raw):
+            return packed
+    return raw
+
+
+# Keys other services read straight from Redis (the chat gateway maps
+# meetings and streams to users through these). They stay plain JSON, with
+# no raw-value tag or LZ4 frame, so those readers don't need our decoder.
+_SHARED_KEY_PREFIXES = ("chat:", "streams:")
+
+
+def _serialize_for(key: str, value: Any) -> bytes:
+    if key.startswith(_SHARED_KEY_PREFIXES):
+        return orjson.dumps(_to_json_safe(value), option=_ORJSON_OPTS)
+    return _serialize(value)
 
 
 def _deserialize(raw: bytes | str) -> Any:
-    text = raw.decode("utf-8") if isinstance(raw, bytes | bytearray) else raw
-    return _from_json_safe(json.loads(text))
+    if isinstance(raw, bytes):
+        tag = raw[:1]
+        if tag == _LZ4:
+            return _deserialize(lz4.frame.decompress(raw[1:]))
+        if tag == _RAW_STR:
+            return raw[1:].decode()
+        if tag == _RAW_BYTES:
+            return raw[1:]
+        if tag == _RAW_INT:
+            return int.from_bytes(raw[1:], "little", signed=True)
+    return _from_json_safe(orjson.loads(raw))
+
+
+# Key prefixes registered by the cache decorators; with client tracking on,
+# Redis broadcasts invalidations for keys under these to every worker.
+_tracked_prefixes: set[str] = set()
+
+
+def _bcast_prefixes(prefixes: set[str]) -> list[str]:
+    """Drop prefixes nested under a shorter one; Redis rejects overlaps."""
+    ordered = sorted(prefixes, key=len)
+    kept: list[str] = []
+    for p in ordered:
+        if not p.startswith(tuple(kept)):
+            kept.append(p)
+    return sorted(kept)
+
+
+def _l1_expiry(_key: str, value: tuple[bytes, float], now: float) -> float:
+    return now + value[1]
 
 
 class RedisCache:
     def __init__(self) -> None:
         self.redis_client: Redis | None = None
+        # Process-local L1 holding the *serialized* payload with a per-entry
+        # TTL of min(redis ttl, cache_l1_ttl). Hot keys skip the Redis round
+        # trip; storing bytes rather than objects means every hit still
+        # returns a fresh instance, so callers can't mutate shared state.
+        self._l1: TLRUCache = TLRUCache(maxsize=settings.cache_l1_maxsize, ttu=_l1_expiry)
+        # Decorator SETs handed off by set_deferred and written in pipelined
+        # batches by _flusher. Each entry records the invalidation epoch it
+        # was queued at, so a delete that lands before the flush drops it
+        # instead of letting the write resurrect a stale value. Invalidations
+        # are only kept while some SET is queued or in flight (_pending_sets).
+        self._set_queue: asyncio.Queue[tuple[str, bytes, int, int]] = asyncio.Queue(_SET_QUEUE_MAX)
+        self._flusher: asyncio.Task[None] | None = None
+        self._epoch = 0
+        self._invalidations: list[tuple[int, str]] = []
+        self._pending_sets = 0
+        self._delete_step: AsyncScript | None = None
+        # Server-assisted invalidation (CLIENT TRACKING, BCAST mode) on a
+        # dedicated connection. While it is up, L1 entries under the
+        # decorator prefixes are evicted by Redis itself, so they can live
+        # for cache_l1_tracked_ttl and be filled from Redis GETs as well.
+        self._tracker: asyncio.Task[None] | None = None
+        self._tracking = False
+        self._tracked: tuple[str, ...] = ()
+        self._tracking_epoch = 0
+        # Serializes connect() so concurrent callers can't build two pools.
+        self._connect_lock = asyncio.Lock()
+
+    def _l1_ttl_for(self, key: str) -> int:
+        if self._tracking and key.startswith(self._tracked):
+            return settings.cache_l1_tracked_ttl
+        return settings.cache_l1_ttl
+
+    def _l1_put(self, key: str, raw: bytes, ttl: int) -> None:
+        l1_ttl = min(ttl, self._l1_ttl_for(key))
+        if l1_ttl > 0:
+            self._l1[key] = (raw, l1_ttl)
+
+    def _on_invalidate(self, keys: list[bytes] | None) -> None:
+        self._tracking_epoch += 1
+        if keys is None:  # FLUSHDB / FLUSHALL
+            self._l1.clear()
+            return
+        for key in keys:
+            self._l1.pop(key.decode() if isinstance(key, bytes) else key, None)
+
+    async def _track_invalidations(self, pool: ConnectionPool) -> None:
+        prefixes = _bcast_prefixes(_tracked_prefixes)
+        args = [a for p in prefixes for a in ("PREFIX", p)]
+        delay = _TRACKING_RETRY_MIN
+        while True:
+            # Plain RESP2 and only public connection calls: the connection
+            # redirects its own invalidations to itself and then subscribes
+            # to them, so they arrive as ordinary pub/sub messages.
+            conn = pool.connection_class(**{**pool.connection_kwargs, "socket_timeout": None})
+            try:
+                await conn.connect()
+                await conn.send_command("CLIENT", "ID")
+                client_id = await conn.read_response()
+                await conn.send_command("CLIENT", "TRACKING", "ON", "REDIRECT", client_id, "BCAST", *args)
+                await conn.read_response()
+                await conn.send_command("SUBSCRIBE", _INVALIDATE_CHANNEL)
+                await conn.read_response()
+                self._tracked = tuple(prefixes)
+                self._tracking = True
+                logger.info(f"Redis client tracking on for {len(prefixes)} prefixes")
+                delay = _TRACKING_RETRY_MIN
+                while True:
+                    message = await conn.read_response()
+                    if isinstance(message, list) and message[0] == b"message":
+                        self._on_invalidate(message[2])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Redis client tracking lost: {e}")
+            finally:
+                # Without invalidations the long-lived entries can't be
+                # trusted; drop them and fall back to the short L1 TTL.
+                if self._tracking:
+                    self._tracking = False
+                    self._l1.clear()
+                await conn.disconnect()
+            await asyncio.sleep(delay * (0.5 + random.random()))
+            delay = min(delay * 2, _TRACKING_RETRY_MAX)
+
+    def _l1_evict_pattern(self, pattern: str) -> None:
+        for key in [k for k in self._l1 if fnmatch.fnmatchcase(k, pattern)]:
+            self._l1.pop(key, None)
+
+    def _note_invalidation(self, pattern: str) -> None:
+        # No pending SET can be older than this delete, so nothing to filter
+        if self._pending_sets:
+            self._epoch += 1
+            self._invalidations.append((self._epoch, pattern))
+
+    def _start_set_flusher(self) -> None:
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_sets())
+
+    async def _flush_sets(self) -> None:
+        while True:
+            batch = [await self._set_queue.get()]
+            await asyncio.sleep(_SET_FLUSH_INTERVAL)
+            while len(batch) < _SET_FLUSH_MAX and not self._set_queue.empty():
+                batch.append(self._set_queue.get_nowait())
+            await self._write_sets(batch)
+
+    async def _write_sets(self, batch: list[tuple[str, bytes, int, int]]) -> None:
+        self._pending_sets -= len(batch)
+        if self._invalidations:
+            batch = [
+                item
+                for item in batch
+                if not any(epoch > item[3] and fnmatch.fnmatchcase(item[0], p) for epoch, p in self._invalidations)
+            ]
+            if not self._pending_sets:
+                self._invalidations = []
+        if not batch or not self.redis_client:
+            return
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for key, raw, ttl, _ in batch:
+                    pipe.setex(key, ttl, raw)
+                await pipe.execute()
+        except Exception as e:
+            logger.error(f"Deferred SET of {len(batch)} keys error: {e}")
 
     async def connect(self) -> None:
-        if self.redis_client:
-            return
+        async with self._connect_lock:
+            if self.redis_client:
+                try:
+                    await self.redis_client.ping()  # type: ignore[misc]
+                    return
+                except Exception as e:
+                    logger.warning(f"Redis client unhealthy, reconnecting: {e}")
+                    await self.close()
+            await self._connect()
+
+    async def _connect(self) -> None:
+        pool: ConnectionPool | None = None
         try:
-            self.redis_client = redis.from_url(
+            # redis-py uses hiredis when it's installed; log which parser is
+            # in play so a missing hiredis wheel shows up in the logs.
+            pool = ConnectionPool.from_url(
                 settings.redis_url,
                 encoding="utf-8",
                 decode_responses=False,
@@ -170,43 +429,149 @@ class RedisCache:
                 socket_timeout=5,
                 socket_connect_timeout=5,
             )
+            self.redis_client = Redis(connection_pool=pool)
             ping_result = await self.redis_client.ping()  # type: ignore[misc]
-            logger.info("Redis connected")
+            logger.info(f"Redis connected (parser: {'hiredis' if HIREDIS_AVAILABLE else 'python'})")
+            # register_script doesn't round-trip: it sends EVALSHA and
+            # transparently loads the script on NOSCRIPT.
+            self._delete_step = self.redis_client.register_script(_DELETE_PATTERN_STEP_LUA)
+            self._start_set_flusher()
+            if settings.cache_client_tracking:
+                self._tracker = asyncio.create_task(self._track_invalidations(pool))
         except Exception as e:
             logger.error(f"Redis connect failed: {e}")
             self.redis_client = None
+            self._delete_step = None
+            if pool is not None:
+                await pool.disconnect()
 
     async def close(self) -> None:
-        if self.redis_client:
+        if self._tracker is not None:
+            self._tracker.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._tracker
+            self._tracker = None
+        if self._flusher is not None:
+            self._flusher.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._flusher
+            self._flusher = None
+            pending = []
+            while not self._set_queue.empty():
+                pending.append(self._set_queue.get_nowait())
+            await self._write_sets(pending)
+        # A pool passed in explicitly isn't closed by Redis.aclose(), so
+        # disconnect it here. The client is cleared either way, so close()
+        # is idempotent and a later connect() builds a fresh pool instead
+        # of returning early on a dead one.
+        client, self.redis_client = self.redis_client, None
+        self._delete_step = None
+        if client is not None:
             try:
-                await self.redis_client.close()
+                await client.aclose()
             except Exception as e:
                 logger.error(f"Redis close error: {e}")
+            finally:
+                try:
+                    await client.connection_pool.disconnect(inuse_connections=True)
+                except Exception as e:
+                    logger.error(f"Redis pool disconnect error: {e}")
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        """Cached value for ``key``, or ``default`` on a miss or error.
 
-    async def get(self, key: str) -> Any | None:
+        Pass a sentinel ``default`` to tell a stored ``None`` from a miss.
+        """
         if not self.redis_client:
-            return None
+            return default
         try:
+            l1_hit = self._l1.get(key)
+            if l1_hit is not None:
+                return _deserialize(l1_hit[0])
+            epoch = self._tracking_epoch
             raw = await self.redis_client.get(key)
             if raw is None:
-                return None
+                return default
+            # Only safe under tracking, and only if no invalidation landed
+            # while the GET was in flight (it may have been for this key).
+            if self._tracking and epoch == self._tracking_epoch and key.startswith(self._tracked):
+                self._l1_put(key, cast(bytes, raw), settings.cache_l1_tracked_ttl)
             return _deserialize(raw)
         except Exception as e:
             logger.error(f"GET {key} error: {e}")
-            return None
+            return default
 
-    async def set(self, key: str, value: Any, ttl: int = 300) -> bool:
+    async def set(self, key: str, value: Any, ttl: int = 300, min_bytes: int = 0) -> bool:
+        """Write ``value`` with ``ttl``; payloads under ``min_bytes`` only go
+        to the L1, since a Redis round trip costs more than recomputing them."""
         if not self.redis_client:
             return False
         try:
-            await self.redis_client.setex(key, ttl, _serialize(value))
-            logger.info(f"Cache SET for key: {key}")
+            raw = _serialize_for(key, value)
+            if len(raw) < min_bytes:
+                self._l1_put(key, raw, ttl)
+                return True
+            await self.redis_client.setex(key, ttl, raw)
+            self._l1_put(key, raw, ttl)
+            logger.debug("Cache SET for key: %s bytes=%d", key, len(raw))
             return True
         except Exception as e:
             logger.error(f"SET {key} error: {e}")
             return False
 
+    def set_deferred(self, key: str, value: Any, ttl: int = 300, min_bytes: int = 0) -> bool:
+        """Queue a SET for the background flusher instead of awaiting it.
+
+        The value goes into the L1 straight away, which is what keeps reads
+        on this worker consistent until the flush; so with the L1 disabled,
+        no flusher running, or the queue full this returns False and the
+        caller should fall back to ``set``.
+        """
+        if self._flusher is None or settings.cache_l1_ttl <= 0:
+            return False
+        raw = _serialize_for(key, value)
+        if len(raw) < min_bytes:
+            self._l1_put(key, raw, ttl)
+            return True
+        try:
+            self._set_queue.put_nowait((key, raw, ttl, self._epoch))
+        except asyncio.QueueFull:
+            return False
+        self._pending_sets += 1
+        self._l1_put(key, raw, ttl)
+        return True
+
+    async def mget(self, keys: list[str]) -> list[Any | None]:
+        """Fetch several keys in one round trip; misses come back as None"""
+        if not self.redis_client or not keys:
+            return [None] * len(keys)
+        try:
+            raws = await self.redis_client.mget(keys)
+            return [None if raw is None else _deserialize(raw) for raw in raws]
+        except Exception as e:
+            logger.error(f"MGET {len(keys)} keys error: {e}")
+            return [None] * len(keys)
+
+    async def mset(self, items: dict[str, Any], ttl: int = 300) -> bool:
+        """Write several keys with a shared TTL in one pipelined round trip"""
+        if not self.redis_client or not items:
+            return False
+        try:
+            raws = {key: _serialize_for(key, value) for key, value in items.items()}
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for key, raw in raws.items():
+                    pipe.setex(key, ttl, raw)
+                await pipe.execute()
+            for key, raw in raws.items():
+                self._l1_put(key, raw, ttl)
+            return True
+        except Exception as e:
+            logger.error(f"MSET {len(items)} keys error: {e}")
+            return False
+
     async def delete(self, key: str) -> bool:
+        self._l1.pop(key, None)
+        self._note_invalidation(glob.escape(key))
         if not self.redis_client:
             return False
         try:
@@ -217,17 +582,60 @@ class RedisCache:
             return False
 
     async def delete_pattern(self, pattern: str) -> bool:
+        self._l1_evict_pattern(pattern)
+        self._note_invalidation(pattern)
         if not self.redis_client:
             return False
+        if self._delete_step is not None:
+            try:
+                cursor: Any = 0
+                while True:
+                    cursor = await self._delete_step(keys=[pattern], args=[cursor, _SCAN_BATCH])
+                    if int(cursor) == 0:
+                        return True
+            except Exception as e:
+                logger.warning(f"Scripted DEL pattern {pattern} failed, falling back to SCAN: {e}")
+        # KEYS walks the whole keyspace in one blocking call and DEL frees
+        # values inline; SCAN iterates incrementally and UNLINK reclaims
+        # memory in a background thread, so neither stalls other clients.
+        # UNLINK batches are queued on a non-transactional pipeline so a
+        # large invalidation costs one round trip per _PIPELINE_FLUSH_BATCHES.
         try:
-            keys = await self.redis_client.keys(pattern)
-            if keys:
-                await self.redis_client.delete(*keys)
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                batch: list[bytes] = []
+                queued = 0
+                async for key in self.redis_client.scan_iter(match=pattern, count=_SCAN_BATCH):
+                    batch.append(key)
+                    if len(batch) >= _SCAN_BATCH:
+                        pipe.unlink(*batch)
+                        batch = []
+                        queued += 1
+                        if queued >= _PIPELINE_FLUSH_BATCHES:
+                            await pipe.execute()
+                            queued = 0
+                if batch:
+                    pipe.unlink(*batch)
+                    queued += 1
+                if queued:
+                    await pipe.execute()
             return True
         except Exception as e:
             logger.error(f"DEL pattern {pattern} error: {e}")
             return False
 
+    async def scan_keys(self, pattern: str) -> list[str]:
+        """Keys matching a glob pattern, via incremental SCAN (never KEYS)"""
+        if not self.redis_client:
+            return []
+        try:
+            return [
+                key.decode() if isinstance(key, bytes) else key
+                async for key in self.redis_client.scan_iter(match=pattern, count=_SCAN_BATCH)
+            ]
+        except Exception as e:
+            logger.error(f"SCAN {pattern} error: {e}")
+            return []
+
     async def health_check(self) -> bool:
         if not self.redis_client:
             return False
@@ -243,8 +651,13 @@ class RedisCache:
         if not self.redis_client:
             return 0
         try:
-            result = await self.redis_client.sadd(key, *values)  # type: ignore[misc]
-            return cast(int, result)
+            if len(values) <= _SET_CHUNK:
+                result = await self.redis_client.sadd(key, *values)  # type: ignore[misc]
+                return cast(int, result)
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for chunk in _chunks(values, _SET_CHUNK):
+                    pipe.sadd(key, *chunk)
+                return sum(await pipe.execute())
         except Exception as e:
             logger.error(f"SADD {key} error: {e}")
             return 0
@@ -254,8 +667,13 @@ class RedisCache:
         if not self.redis_client:
             return 0
         try:
-            result = await self.redis_client.srem(key, *values)  # type: ignore[misc]
-            return cast(int, result)
+            if len(values) <= _SET_CHUNK:
+                result = await self.redis_client.srem(key, *values)  # type: ignore[misc]
+                return cast(int, result)
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for chunk in _chunks(values, _SET_CHUNK):
+                    pipe.srem(key, *chunk)
+                return sum(await pipe.execute())
         except Exception as e:
             logger.error(f"SREM {key} error: {e}")
             return 0
@@ -298,68 +716,163 @@ cache: RedisCache = RedisCache()
 
 
 def generate_cache_key(*args: Any, **kwargs: Any) -> str:
-    key_data = str(args) + str(sorted(kwargs.items()))
-    return hashlib.md5(key_data.encode()).hexdigest()
+    # BLAKE2b-128 is noticeably faster than MD5 and keeps the same 32-char
+    # hex key shape; feeding args and kwargs separately skips building one
+    # concatenated string.
+    h = hashlib.blake2b(digest_size=16)
+    h.update(str(args).encode())
+    if kwargs:
+        h.update(b"\x00")
+        h.update(str(sorted(kwargs.items())).encode())
+    return h.hexdigest()
 
 
 P = ParamSpec("P")
 R = TypeVar("R")
 
+# Cache keys whose miss is currently being computed, mapped to an event set
+# once the leader has finished (and written the result back). Concurrent
+# misses on the same key wait here instead of re-running the function.
+_inflight: dict[str, asyncio.Event] = {}
+# Miss marker for the decorators, so a cached ``None`` counts as a hit.
+_MISS: Any = object()
+
+
+async def _cache_get_logged(k: str) -> Any:
+    try:
+        return await cache.get(k, _MISS)
+    except Exception as e:
+        logger.error(f"Decorator GET error ({k}): {e}")
+        return _MISS
+
+
+async def _cached_call(
+    k: str,
+    ttl: int,
+    cache_none: bool,
+    min_bytes: int,
+    func: Callable[P, Coroutine[Any, Any, R]],
+    *args: P.args,
+    **kwargs: P.kwargs,
+) -> R:
+    """Read-through for the cache decorators, with single-flight on misses.
+
+    Followers don't share the leader's return value: it may be an ORM
+    instance bound to the leader's session. They re-read the key instead,
+    which the leader's SET (inline or deferred) has just put in the L1, and
+    only fall back to calling ``func`` themselves if that still misses
+    (leader failed or the value wasn't cacheable).
+
+    ``None`` results are only stored with ``cache_none``; results that
+    serialize under ``min_bytes`` stay in the L1 and never reach Redis.
+    """
+    hit = await _cache_get_logged(k)
+    if hit is not _MISS:
+        logger.debug("Cache HIT for key: %s", k)
+        return cast(R, hit)
+
+    pending = _inflight.get(k)
+    if pending is not None:
+        await pending.wait()
+        hit = await _cache_get_logged(k)
+        if hit is not _MISS:
+            return cast(R, hit)
+        return await func(*args, **kwargs)
+
+    done = asyncio.Event()
+    _inflight[k] = done
+    try:
+        result: R = await func(*args, **kwargs)
+        if result is None and not cache_none:
+            return result
+        try:
+            # Keep the Redis write off the response path when possible
+            if not cache.set_deferred(k, result, ttl, min_bytes):
+                await cache.set(k, result, ttl, min_bytes)
+        except Exception as e:
+            logger.error(f"Decorator SET error ({k}): {e}")
+        return result
+    finally:
+        del _inflight[k]
+        done.set()
+
 
 def cached(
-    ttl: int = 300, key_prefix: str = ""
+    ttl: int = 300,
+    key_prefix: str = "",
+    version: int = 1,
+    cache_none: bool = False,
+    min_bytes: int = 0,
 ) -> Callable[[Callable[P, Coroutine[Any, Any, R]]], Callable[P, Coroutine[Any, Any, R]]]:
+    """Cache an async function's result under ``key_prefix``.
+
+    ``version`` is part of the key: bump it whenever the shape of the
+    cached return value changes, so old payloads are simply never read
+    again and age out via TTL instead of needing a pattern delete.
+
+    ``None`` results aren't cached unless ``cache_none`` is set (useful for
+    negative lookups such as a missing row). Results whose payload is
+    smaller than ``min_bytes`` are kept only in the in-process L1.
+    """
+
     def decorator(
         func: Callable[P, Coroutine[Any, Any, R]],
     ) -> Callable[P, Coroutine[Any, Any, R]]:
+        prefix = f"{key_prefix}:v{version}:{func.__name__}:"
+        _tracked_prefixes.add(f"{key_prefix}:")
+
         @wraps(func)
         async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
-            k: str = f"{key_prefix}:{func.__name__}:{generate_cache_key(*args, **kwargs)}"
-            hit: R | None = None
-            try:
-                hit = cast(R | None, await cache.get(k))
-            except Exception as e:
-                logger.error(f"Decorator GET error ({k}): {e}")
-            if hit is not None:
-                logger.info(f"Cache HIT for key: {k}")
-                return hit
-            result: R = await func(*args, **kwargs)
-            try:
-                await cache.set(k, result, ttl)
-            except Exception as e:
-                logger.error(f"Decorator SET error ({k}): {e}")
-            return result
+            k: str = prefix + generate_cache_key(*args, **kwargs)
+            return await _cached_call(k, ttl, cache_none, min_bytes, func, *args, **kwargs)
 
         return wrapper
 
     return decorator
 
 
+def _session_param(func: Callable[..., Any]) -> tuple[int, str] | None:
+    """Position and name of the single ``AsyncSession`` parameter, if the
+    signature annotates exactly one; ``None`` means filter by isinstance."""
+    found = [
+        (i, p.name)
+        for i, p in enumerate(inspect.signature(func).parameters.values())
+        if p.annotation is AsyncSession or p.annotation == "AsyncSession"
+    ]
+    return found[0] if len(found) == 1 else None
+
+
 def cached_db(
-    ttl: int = 300, key_prefix: str = ""
+    ttl: int = 300,
+    key_prefix: str = "",
+    version: int = 1,
+    cache_none: bool = False,
+    min_bytes: int = 0,
 ) -> Callable[[Callable[P, Coroutine[Any, Any, R]]], Callable[P, Coroutine[Any, Any, R]]]:
+    """Like ``cached``, but leaves ``AsyncSession`` arguments out of the key."""
+
     def decorator(
         func: Callable[P, Coroutine[Any, Any, R]],
     ) -> Callable[P, Coroutine[Any, Any, R]]:
+        prefix = f"{key_prefix}:v{version}:{func.__name__}:"
+        _tracked_prefixes.add(f"{key_prefix}:")
+        session_param = _session_param(func)
+
         @wraps(func)
         async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
-            filt_args = [a for a in args if not isinstance(a, AsyncSession)]
-            filt_kwargs = {k: v for k, v in kwargs.items() if not isinstance(v, AsyncSession)}
-            k: str = f"{key_prefix}:{func.__name__}:{generate_cache_key(*filt_args, **filt_kwargs)}"
-            hit: R | None = None
-            try:
-                hit = cast(R | None, await cache.get(k))
-            except Exception as e:
-                logger.error(f"Decorator GET error ({k}): {e}")
-            if hit is not None:
-                logger.info(f"Cache HIT for key: {k}")
-                return hit
-            result: R = await func(*args, **kwargs)
-            try:
-                await cache.set(k, result, ttl)
-            except Exception as e:
-                logger.error(f"Decorator SET error ({k}): {e}")
-            return result
+            filt_args: Sequence[Any]
+            filt_kwargs: dict[str, Any]
+            if session_param is None:
+                filt_args = [a for a in args if not isinstance(a, AsyncSession)]
+                filt_kwargs = {k: v for k, v in kwargs.items() if not isinstance(v, AsyncSession)}
+            else:
+                # Known slot: drop it by slicing instead of type-checking
+                # every argument on each call.
+                idx, name = session_param
+                filt_args = args[:idx] + args[idx + 1 :] if len(args) > idx else args
+                filt_kwargs = {k: v for k, v in kwargs.items() if k != name} if name in kwargs else kwargs
+            k: str = prefix + generate_cache_key(*filt_args, **filt_kwargs)
+            return await _cached_call(k, ttl, cache_none, min_bytes, func, *args, **kwargs)
 
         return wrapper
 
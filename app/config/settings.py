@@ -103,6 +103,14 @@ class Settings(BaseSettings):
     cache_ttl_long: int = 3600  # 1 hour
     cache_ttl_user: int = 900  # 15 minutes
     cache_ttl_bbb: int = 180  # 3 minutes (BBB data changes frequently)
+    # In-process L1 in front of Redis GETs. Invalidations only reach the
+    # local worker's L1, so keep the TTL short; 0 disables it.
+    cache_l1_ttl: int = 5
+    cache_l1_maxsize: int = 4096
+    # Redis >= 6 CLIENT TRACKING: Redis pushes invalidations for decorator
+    # keys, so their L1 entries can be kept much longer than cache_l1_ttl.
+    cache_client_tracking: bool = False
+    cache_l1_tracked_ttl: int = 300
 
     # Chat Gateway settings
     chat_gateway_url: str = "http://localhost:8081"
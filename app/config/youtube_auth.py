@@ -1,14 +1,19 @@
-import secrets
-from urllib.parse import urlencode
-
 import httpx
+import orjson
 
+from app.config.http_client import authorization_url, get_oauth_client
 from app.config.logger_config import get_logger
 from app.config.settings import get_settings
 
 settings = get_settings()
 logger = get_logger("YouTubeAuth")
 
+GOOGLE_AUTHORIZE_URL = "https://accounts.google.com/o/oauth2/v2/auth"
+GOOGLE_TOKEN_URL = "https://oauth2.googleapis.com/token"
+YOUTUBE_CHANNELS_URL = "https://www.googleapis.com/youtube/v3/channels"
+_FORM_HEADERS = {"Content-Type": "application/x-www-form-urlencoded"}
+_OWN_CHANNEL_PARAMS = {"part": "snippet", "mine": "true"}
+
 
 class YouTubeAuth:
     def __init__(self):
@@ -22,35 +27,33 @@ class YouTubeAuth:
 
     def get_authorization_url(self) -> str:
         """Generate the URL for user authorization"""
-        state = secrets.token_urlsafe(32)
-        params = {
-            "client_id": self.client_id,
-            "redirect_uri": self.redirect_uri,
-            "response_type": "code",
-            "scope": " ".join(self.scopes),
-            "state": state,
-            "access_type": "offline",  # Important for refresh token
-            "prompt": "consent",  # Force consent to get refresh token
-        }
-        return f"https://accounts.google.com/o/oauth2/v2/auth?{urlencode(params)}"
+        return authorization_url(
+            GOOGLE_AUTHORIZE_URL,
+            client_id=self.client_id,
+            redirect_uri=self.redirect_uri,
+            response_type="code",
+            scope=" ".join(self.scopes),
+            access_type="offline",  # Important for refresh token
+            prompt="consent",  # Force consent to get refresh token
+        )
 
     async def exchange_code_for_token(self, code: str) -> dict:
         """Exchange authorization code for access token"""
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    "https://oauth2.googleapis.com/token",
-                    data={
-                        "client_id": self.client_id,
-                        "client_secret": self.client_secret,
-                        "code": code,
-                        "grant_type": "authorization_code",
-                        "redirect_uri": self.redirect_uri,
-                    },
-                    headers={"Content-Type": "application/x-www-form-urlencoded"},
-                )
-                response.raise_for_status()
-                return response.json()
+            client = get_oauth_client()
+            response = await client.post(
+                GOOGLE_TOKEN_URL,
+                data={
+                    "client_id": self.client_id,
+                    "client_secret": self.client_secret,
+                    "code": code,
+                    "grant_type": "authorization_code",
+                    "redirect_uri": self.redirect_uri,
+                },
+                headers=_FORM_HEADERS,
+            )
+            response.raise_for_status()
+            return orjson.loads(response.content)
         except httpx.HTTPStatusError as e:
             logger.error(f"Token exchange failed: {e.response.status_code} - {e.response.text}")
             raise
@@ -61,24 +64,46 @@ class YouTubeAuth:
     async def refresh_access_token(self, refresh_token: str) -> dict:
         """Refresh the access token using refresh token"""
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    "https://oauth2.googleapis.com/token",
-                    data={
-                        "client_id": self.client_id,
-                        "client_secret": self.client_secret,
-                        "refresh_token": refresh_token,
-                        "grant_type": "refresh_token",
-                    },
-                    headers={"Content-Type": "application/x-www-form-urlencoded"},
-                )
-                response.raise_for_status()
-                token_data = response.json()
-                logger.info("Access token refreshed successfully")
-                return token_data
+            client = get_oauth_client()
+            response = await client.post(
+                GOOGLE_TOKEN_URL,
+                data={
+                    "client_id": self.client_id,
+                    "client_secret": self.client_secret,
+                    "refresh_token": refresh_token,
+                    "grant_type": "refresh_token",
+                },
+                headers=_FORM_HEADERS,
+            )
+            response.raise_for_status()
+            token_data = orjson.loads(response.content)
+            logger.info("Access token refreshed successfully")
+            return token_data
         except httpx.HTTPStatusError as e:
             logger.error(f"Token refresh failed: {e.response.status_code} - {e.response.text}")
             raise
         except Exception as e:
             logger.error(f"Token refresh error: {e}")
             raise
+
+    async def get_channel_identity(self, access_token: str) -> tuple[str, str] | None:
+        """Return (channel_id, channel_title) for the authorizing account.
+
+        Costs one quota unit, so it is looked up once at connect time and
+        stored on the connection. Returns None if the lookup fails.
+        """
+        try:
+            client = get_oauth_client()
+            response = await client.get(
+                YOUTUBE_CHANNELS_URL,
+                params=_OWN_CHANNEL_PARAMS,
+                headers={"Authorization": f"Bearer {access_token}"},
+            )
+            response.raise_for_status()
+            items = orjson.loads(response.content).get("items") or []
+            if not items:
+                return None
+            return items[0]["id"], items[0]["snippet"]["title"]
+        except Exception as e:
+            logger.warning(f"Channel identity lookup failed: {e}")
+            return None
@@ -1,9 +1,7 @@
 from fastapi import APIRouter, Body, Depends, HTTPException, status
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config.database.session import get_db
-from app.models.bbb_models import BbbMeeting
 from app.models.bbb_schemas import (
     BroadcasterRobot,
     BroadcastStatusResponse,
@@ -27,14 +25,11 @@ async def start_broadcaster(
     payload: BroadcasterRobot = Body(...),
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(select(BbbMeeting).where(BbbMeeting.meeting_id == payload.meeting_id))
-    meeting = result.scalar_one_or_none()
+    user_id = await bbb_service.get_meeting_owner_id(payload.meeting_id, db)
 
-    if not meeting:
+    if not user_id:
         raise HTTPException(status_code=404, detail="Meeting not found")
 
-    user_id = str(meeting.user_id)
-
     return await broadcaster_service.start_broadcasting(
         meeting_id=payload.meeting_id,
         rtmp_url=payload.rtmp_url,
@@ -15,6 +15,7 @@ from app.services.connection_service import ConnectionService
 
 router = APIRouter(prefix="/auth", tags=["Facebook Authentication"])
 logger = logging.getLogger(__name__)
+fb_auth = FacebookAuth()
 
 FACEBOOK_SCOPES = [
     "publish_video",
@@ -54,8 +55,6 @@ async def facebook_callback(
         return RedirectResponse(url=f"{settings.frontend_url}/settings?{error_params}", status_code=302)
 
     try:
-        fb_auth = FacebookAuth()
-
         # Exchange code for short-lived token
         short_token_data = await fb_auth.exchange_code_for_token(code)
 
@@ -129,7 +128,6 @@ async def facebook_callback(
 @router.get("/facebook/login")
 async def facebook_login(current_user: User = Depends(get_current_user)):
     """Return the Facebook OAuth authorization URL."""
-    fb_auth = FacebookAuth()
     authorization_url = fb_auth.get_authorization_url()
     return {"authorization_url": authorization_url, "user_id": str(current_user.id)}
 
@@ -223,7 +221,6 @@ async def facebook_go_live(
         target_id = body.target
 
     try:
-        fb_auth = FacebookAuth()
         result = await fb_auth.create_live_video(
             access_token=access_token,
             target_id=target_id,
@@ -270,7 +267,6 @@ async def facebook_end_live(
         raise HTTPException(status_code=404, detail="No Facebook connection found.")
 
     try:
-        fb_auth = FacebookAuth()
         result = await fb_auth.end_live_video(
             access_token=token["access_token"],
             live_video_id=live_video_id,
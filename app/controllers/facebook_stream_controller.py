@@ -1,35 +1,39 @@
+import hmac
 import logging
 import os
 
 from fastapi import APIRouter, Body, Depends, Header, HTTPException
 from pydantic import BaseModel
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config.database.session import get_db
 from app.config.facebook_auth import FacebookAuth
-from app.models.bbb_models import BbbMeeting
+from app.services.bbb_service import BBBService
 from app.services.connection_service import ConnectionService
 
 router = APIRouter(prefix="/api/streaming/facebook", tags=["Facebook Streaming"])
 
 logger = logging.getLogger("FacebookStreamController")
 PLUGIN_SECRET = os.getenv("CHAT_GATEWAY_SHARED_SECRET", "dev-secret")
+_PLUGIN_SECRET_BYTES = PLUGIN_SECRET.encode()
+
+bbb_service = BBBService()
+fb_auth = FacebookAuth()
 
 
 def verify_plugin_auth(x_internal_auth: str = Header(None, alias="X-Internal-Auth")):
     """Verify shared secret for internal streaming clients."""
-    if x_internal_auth != PLUGIN_SECRET:
+    # Constant-time compare so response timing doesn't leak the secret
+    if not hmac.compare_digest((x_internal_auth or "").encode(), _PLUGIN_SECRET_BYTES):
         raise HTTPException(status_code=401, detail="Unauthorized")
 
 
 async def _get_user_id_from_meeting(meeting_id: str, db: AsyncSession) -> str:
     """Look up user_id from a meeting_id."""
-    result = await db.execute(select(BbbMeeting).where(BbbMeeting.meeting_id == meeting_id))
-    meeting = result.scalar_one_or_none()
-    if not meeting:
+    user_id = await bbb_service.get_meeting_owner_id(meeting_id, db)
+    if not user_id:
         raise HTTPException(status_code=404, detail="Meeting not found")
-    return str(meeting.user_id)
+    return user_id
 
 
 @router.get("/status/{meeting_id}")
@@ -134,7 +138,6 @@ async def facebook_go_live(
         )
 
     try:
-        fb_auth = FacebookAuth()
         result = await fb_auth.create_live_video(
             access_token=token["access_token"],
             target_id=body.target,
@@ -185,7 +188,6 @@ async def facebook_end_live(
         raise HTTPException(status_code=404, detail="No Facebook connection found.")
 
     try:
-        fb_auth = FacebookAuth()
         await fb_auth.end_live_video(
             access_token=token["access_token"],
             live_video_id=body.live_video_id,
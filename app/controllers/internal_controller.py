@@ -1,7 +1,10 @@
+import hmac
 import logging
 import os
+from uuid import UUID
 
 from fastapi import APIRouter, Depends, Header, HTTPException
+from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config.database.session import get_db
@@ -11,12 +14,30 @@ router = APIRouter(prefix="/api/internal", tags=["Internal"])
 logger = logging.getLogger("InternalAPI")
 
 SHARED_SECRET = os.getenv("CHAT_GATEWAY_SHARED_SECRET", "dev-secret")
+_SHARED_SECRET_BYTES = SHARED_SECRET.encode()
 
 VALID_PROVIDERS = {"twitch", "youtube", "facebook", "facebook_page"}
 
+# Upper bound on users per batch token request
+MAX_BATCH_USERS = 500
+
+
+class TokenBatchRequest(BaseModel):
+    provider: str
+    user_ids: list[UUID] = Field(max_length=MAX_BATCH_USERS)
+
+
+def _check_provider(provider: str) -> None:
+    if provider not in VALID_PROVIDERS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid provider '{provider}'. Must be one of: {', '.join(VALID_PROVIDERS)}",
+        )
+
 
 def verify_internal_auth(x_internal_auth: str = Header(None, alias="X-Internal-Auth")):
-    if x_internal_auth != SHARED_SECRET:
+    # Constant-time compare so response timing doesn't leak the secret
+    if not hmac.compare_digest((x_internal_auth or "").encode(), _SHARED_SECRET_BYTES):
         logger.warning("[Internal] Unauthorized access attempt")
         raise HTTPException(status_code=401, detail="Unauthorized")
 
@@ -24,16 +45,12 @@ def verify_internal_auth(x_internal_auth: str = Header(None, alias="X-Internal-A
 @router.get("/token/{provider}/{user_id}")
 async def get_provider_token(
     provider: str,
-    user_id: str,
+    user_id: UUID,
     db: AsyncSession = Depends(get_db),
     _auth: None = Depends(verify_internal_auth),
 ):
     """Unified internal endpoint for gateway to fetch provider tokens (with auto-refresh)."""
-    if provider not in VALID_PROVIDERS:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid provider '{provider}'. Must be one of: {', '.join(VALID_PROVIDERS)}",
-        )
+    _check_provider(provider)
 
     try:
         token_data = await ConnectionService.get_valid_token(db=db, user_id=user_id, provider=provider)
@@ -51,12 +68,35 @@ async def get_provider_token(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.post("/tokens")
+async def get_provider_tokens(
+    body: TokenBatchRequest,
+    db: AsyncSession = Depends(get_db),
+    _auth: None = Depends(verify_internal_auth),
+):
+    """Fetch tokens for many users of one provider in a single call.
+
+    Returns {user_id: token}; users without an active token are omitted,
+    as are tokens due for refresh (refreshed in the background; fetch
+    them again shortly or via the single-user endpoint).
+    """
+    _check_provider(body.provider)
+
+    try:
+        tokens = await ConnectionService.get_valid_tokens(db=db, user_ids=body.user_ids, provider=body.provider)
+        logger.info(f"[Internal] Fetched {len(tokens)}/{len(body.user_ids)} {body.provider} token(s)")
+        return tokens
+    except Exception as e:
+        logger.error(f"[Internal] Error fetching {body.provider} tokens: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
 # --- Backward-compatible endpoints ---
 
 
 @router.get("/twitch-token/{user_id}")
 async def get_twitch_token(
-    user_id: str,
+    user_id: UUID,
     db: AsyncSession = Depends(get_db),
     _auth: None = Depends(verify_internal_auth),
 ):
@@ -66,7 +106,7 @@ async def get_twitch_token(
 
 @router.get("/youtube-token/{user_id}")
 async def get_youtube_token(
-    user_id: str,
+    user_id: UUID,
     db: AsyncSession = Depends(get_db),
     _auth: None = Depends(verify_internal_auth),
 ):
@@ -4,17 +4,18 @@ Handles all payment-related API endpoints including subscription management,
 checkout, webhooks, and plan information.
 """
 
+import asyncio
+
 import stripe
-from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
-from sqlalchemy import select
+from cachetools import TTLCache
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response, status
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
 
 from app.api.dependencies import get_current_user  # re-exported below for backwards compat
 from app.config.database.session import get_db
 from app.config.logger_config import get_logger
 from app.config.settings import get_settings
-from app.models.payment_models import Subscription
 from app.models.payment_schemas import (
     CancelSubscriptionRequest,
     CheckoutSessionResponse,
@@ -37,6 +38,12 @@ router = APIRouter(prefix="/api/payments", tags=["payments"])
 
 __all__ = ["get_current_user", "router"]
 
+# Plan metadata only changes with config/deploys, so keep the rendered JSON
+PLANS_CACHE_TTL_SECONDS = 3600
+_plans_cache: TTLCache = TTLCache(maxsize=1, ttl=PLANS_CACHE_TTL_SECONDS)
+_plans_adapter = TypeAdapter(list[PlanInfo])
+_transactions_adapter = TypeAdapter(list[TransactionResponse])
+
 
 @router.post("/checkout", response_model=CheckoutSessionResponse)
 @limiter.limit(lambda: settings.rate_limit_payments)
@@ -115,9 +122,11 @@ async def get_subscription(
         # Create free trial subscription if user doesn't have one
         subscription = await PaymentService.create_free_subscription(user, db)
 
-    # Best-effort reconcile with Stripe in case webhooks didn't update yet
+    # Best-effort reconcile with Stripe in case webhooks didn't update yet,
+    # rate-limited per user so most fetches skip the Stripe round-trip
     try:
-        subscription = await PaymentService.reconcile_subscription_from_stripe(user, db) or subscription
+        if await PaymentService.claim_reconcile(user.id):
+            subscription = await PaymentService.reconcile_subscription_from_stripe(user, db) or subscription
     except Exception as e:
         logger.warning(f"Subscription reconcile skipped: {str(e)}")
 
@@ -126,8 +135,12 @@ async def get_subscription(
 
     # Add plan limits to response (computed from current plan)
     limits = subscription.get_plan_limits()
+    PaymentService.cache_plan_limits(user.id, limits)
 
-    return SubscriptionWithLimits(**subscription.__dict__, limits=PlanLimits(**limits))
+    # Validate straight from the ORM attributes (from_attributes) rather than
+    # splatting __dict__, then attach limits without re-validating the fields
+    response = SubscriptionResponse.model_validate(subscription)
+    return SubscriptionWithLimits.model_construct(**dict(response), limits=PlanLimits(**limits))
 
 
 @router.post("/subscription/cancel", response_model=SubscriptionResponse)
@@ -164,8 +177,11 @@ async def get_plans():
     Get available subscription plans with pricing and features
     """
     try:
-        plans = await PaymentService.get_available_plans()
-        return plans
+        body = _plans_cache.get("plans")
+        if body is None:
+            plans = await PaymentService.get_available_plans()
+            body = _plans_cache["plans"] = _plans_adapter.dump_json(plans)
+        return Response(content=body, media_type="application/json")
     except Exception as e:
         logger.error(f"Error fetching plans: {str(e)}")
         raise HTTPException(
@@ -181,13 +197,17 @@ async def stripe_webhook(
     db: AsyncSession = Depends(get_db),
 ):
     """
-    Handle Stripe webhook events
+    Handle Stripe webhook events.
+    Processed before acknowledging: a failure returns 500 so Stripe
+    redelivers the event instead of it being lost.
     """
     payload = await request.body()
 
     try:
-        # Verify webhook signature
-        event = stripe.Webhook.construct_event(payload, stripe_signature, settings.stripe_webhook_secret)
+        # Verify webhook signature (HMAC + JSON parse) off the event loop
+        event = await asyncio.to_thread(
+            stripe.Webhook.construct_event, payload, stripe_signature, settings.stripe_webhook_secret
+        )
     except ValueError as e:
         logger.error(f"Invalid webhook payload: {str(e)}")
         raise HTTPException(status_code=400, detail="Invalid payload")
@@ -224,20 +244,26 @@ async def get_transactions(
     (webhooks may be absent or delayed).
     """
     try:
-        subscription = await PaymentService.get_user_subscription(user, db)
+        subscription = await PaymentService.get_user_subscription_with_transactions(user, db)
 
         if not subscription:
             return []
 
         # Sync transactions from Stripe invoices (idempotent — skips duplicates)
         try:
-            await PaymentService.sync_transactions_from_stripe(subscription, db)
+            synced = await PaymentService.sync_transactions_from_stripe(subscription, db)
         except Exception as e:
             logger.warning(f"Transaction sync from Stripe skipped: {e}")
+            synced = []
+
+        # Only reload the collection when the sync actually inserted rows
+        if synced:
+            await db.refresh(subscription, ["transactions"])
 
-        # Reload transactions after potential sync
-        await db.refresh(subscription, ["transactions"])
-        return subscription.transactions
+        # Validate and serialize in one pydantic-core pass instead of FastAPI's
+        # response_model round-trip through jsonable_encoder + stdlib json
+        transactions = _transactions_adapter.validate_python(subscription.transactions, from_attributes=True)
+        return Response(content=_transactions_adapter.dump_json(transactions), media_type="application/json")
     except Exception as e:
         logger.error(f"Error fetching transactions: {str(e)}")
         raise HTTPException(
@@ -272,11 +298,11 @@ async def get_current_limits(
     Get current user's subscription plan limits
     """
 
-    # Eagerly load user relationship to avoid lazy loading issues
-    result = await db.execute(
-        select(Subscription).options(joinedload(Subscription.user)).where(Subscription.user_id == user.id)
-    )
-    subscription = result.unique().scalar_one_or_none()
+    cached = PaymentService.get_cached_plan_limits(user.id)
+    if cached is not None:
+        return cached
+
+    subscription = await PaymentService.get_user_subscription(user, db)
 
     if not subscription:
         if user.has_used_free_trial:
@@ -285,7 +311,10 @@ async def get_current_limits(
                 detail="Your 14-day free trial has expired. Please upgrade to a paid plan.",
             )
         subscription = await PaymentService.create_free_subscription(user, db)
-        # Refresh to load the user relationship
-        await db.refresh(subscription, ["user"])
 
-    return subscription.get_plan_limits()
+    # get_plan_limits only reads user.unlimited_access; the subscription's
+    # owner is the current user, so attach it instead of joining or refreshing
+    subscription.user = user
+    limits = subscription.get_plan_limits()
+    PaymentService.cache_plan_limits(user.id, limits)
+    return limits
@@ -14,6 +14,7 @@ from app.services.connection_service import ConnectionService
 
 router = APIRouter(prefix="/auth", tags=["Twitch Authentication"])
 logger = logging.getLogger(__name__)
+twitch_auth = TwitchAuth()
 
 TWITCH_SCOPES = ["chat:read", "chat:edit"]
 
@@ -37,7 +38,6 @@ async def twitch_callback(
         )
 
     try:
-        twitch_auth = TwitchAuth()
         token_data = await twitch_auth.exchange_code_for_token(code)
 
         # Save the connection (encrypts tokens, revokes old one)
@@ -71,7 +71,6 @@ async def twitch_callback(
 @router.get("/twitch/login")
 async def twitch_login(current_user: User = Depends(get_current_user)):
     """Redirect user to Twitch for authorization"""
-    twitch_auth = TwitchAuth()
     auth_url = twitch_auth.get_authorization_url()
     return {
         "authorization_url": auth_url,
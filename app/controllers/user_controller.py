@@ -21,6 +21,7 @@ from app.models.user_schemas import (
     UserResponse,
 )
 from app.services.auth_service import AuthService
+from app.services.bbb_service import forget_meetings_owned_by
 from app.services.cached.user_service_cached import user_service_cached
 
 __all__ = ["get_current_user"]
@@ -259,6 +260,7 @@ async def delete_user_by_admin(
         target_keycloak_id = target_user.keycloak_id
         await db.delete(target_user)
         await db.commit()
+        forget_meetings_owned_by(user_id)
         logger.info(f"[{request_id}] Deleted user {user_id} from database")
 
         try:
@@ -603,6 +605,7 @@ async def delete_account(
         if user_to_delete:
             await db.delete(user_to_delete)
             await db.commit()
+            forget_meetings_owned_by(current_user.id)
             logger.info(f"[{request_id}] Deleted user {current_user.id} from database")
 
         # Step 4: Invalidate all user caches
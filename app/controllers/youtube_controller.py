@@ -15,6 +15,7 @@ from app.services.connection_service import ConnectionService
 
 router = APIRouter(prefix="/auth", tags=["YouTube Authentication"])
 logger = logging.getLogger(__name__)
+youtube_auth = YouTubeAuth()
 
 YOUTUBE_SCOPES = [
     "https://www.googleapis.com/auth/youtube.readonly",
@@ -40,18 +41,27 @@ async def youtube_callback(
         return RedirectResponse(url=f"{settings.frontend_url}/settings?{error_params}", status_code=302)
 
     try:
-        youtube_auth = YouTubeAuth()
         token_data = await youtube_auth.exchange_code_for_token(code)
+        channel = await youtube_auth.get_channel_identity(token_data["access_token"])
 
         # Save the connection (encrypts tokens, revokes old one)
-        await ConnectionService.save_connection(
+        connection = await ConnectionService.save_connection(
             db=db,
             user_id=current_user.id,
             provider="youtube",
             token_data=token_data,
             scopes=YOUTUBE_SCOPES,
+            display_name=channel[1] if channel else None,
         )
 
+        # Store the channel id so the gateway gets it with the token instead
+        # of calling channels.list on every reconnect. Set after the save, not
+        # passed in: save_connection would match on it and leave a previous
+        # channel's connection in place.
+        if channel and connection.provider_user_id != channel[0]:
+            connection.provider_user_id = channel[0]
+            await db.commit()
+
         logger.info(f"[YouTube] Connection saved for user {current_user.id}")
 
         # Notify gateway to start polling connection
@@ -74,7 +84,6 @@ async def youtube_callback(
 @router.get("/youtube/login")
 async def youtube_login(current_user: User = Depends(get_current_user)):
     """Redirect user to YouTube for authorization"""
-    youtube_auth = YouTubeAuth()
     auth_url = youtube_auth.get_authorization_url()
     return {
         "authorization_url": auth_url,
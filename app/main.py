@@ -13,6 +13,7 @@ from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
 
 from app.config.database.session import SessionLocal
+from app.config.http_client import close_oauth_client
 from app.config.logger_config import get_logger
 from app.config.redis_config import cache
 from app.config.settings import get_settings
@@ -45,6 +46,7 @@ from app.models import (  # noqa: F401
     user_models,
 )
 from app.services.bbb_service import BBBService
+from app.services.chat_gateway_client import chat_gateway_client
 from app.services.event_reminder_service import EventReminderService
 from app.services.stream_cleanup_service import StreamCleanupService
 from app.services.token_refresh_service import TokenRefreshService
@@ -121,12 +123,8 @@ async def lifespan(app: FastAPI):
     logger.info("[Scheduler] BBB meeting cleanup job scheduled")
 
     # Set up scheduler for stream cleanup (every 5 minutes)
-    async def _stream_cleanup_job():
-        async with SessionLocal() as db:
-            await StreamCleanupService.cleanup_stale_streams(db)
-
     scheduler.add_job(
-        _stream_cleanup_job,
+        StreamCleanupService.cleanup_stale_streams,
         trigger=IntervalTrigger(minutes=5),
         id="stream_cleanup_job",
         name="Stream Cleanup Job",
@@ -135,20 +133,9 @@ async def lifespan(app: FastAPI):
     )
     logger.info("[Scheduler] Stream cleanup job scheduled (every 5 min)")
 
-    # Set up scheduler for token refresh (every 30 minutes)
-    async def _token_refresh_job():
-        async with SessionLocal() as db:
-            await TokenRefreshService.refresh_expiring_tokens(db)
-
-    scheduler.add_job(
-        _token_refresh_job,
-        trigger=IntervalTrigger(minutes=30),
-        id="token_refresh_job",
-        name="Token Refresh Job",
-        replace_existing=True,
-        misfire_grace_time=600,  # 10 min grace
-    )
-    logger.info("[Scheduler] Token refresh job scheduled (every 30 min)")
+    # Set up token refresh (re-arms itself for the next expiry)
+    TokenRefreshService.start(scheduler)
+    logger.info("[Scheduler] Token refresh job scheduled (expiry-driven)")
 
     # Set up scheduler for event reminders (every 15 minutes)
     async def _event_reminder_job():
@@ -176,6 +163,8 @@ async def lifespan(app: FastAPI):
     logger.info("[Scheduler] Shut down")
     await cache.close()
     logger.info("[cache] Redis cache connection closed")
+    await close_oauth_client()
+    await chat_gateway_client.close()
 
     logger.info("=== APPLICATION SHUTDOWN COMPLETE ===")
 
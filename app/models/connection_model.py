@@ -10,6 +10,7 @@ from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.config.database.session import Base
+from app.utils.datetime_utils import utcnow
 
 if TYPE_CHECKING:
     from app.models.user_models import User
@@ -27,11 +28,11 @@ class Connection(Base):
     refresh_token: Mapped[str | None] = mapped_column(Text, nullable=True)
     scopes: Mapped[str | None] = mapped_column(Text, nullable=True)
     expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now())
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=utcnow)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime,
-        default=lambda: datetime.now(),
-        onupdate=lambda: datetime.now(),
+        default=utcnow,
+        onupdate=utcnow,
     )
     revoked_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True, default=None)
 
@@ -49,6 +50,20 @@ class Connection(Base):
             unique=True,
             postgresql_where=text("revoked_at IS NULL"),
         ),
+        # Serves the newest-active-connection lookup without a sort
+        Index(
+            "ix_connections_user_provider_created_active",
+            "user_id",
+            "provider",
+            text("created_at DESC"),
+            postgresql_where=text("revoked_at IS NULL"),
+        ),
+        # TokenRefreshService's expiring-soon scan
+        Index(
+            "ix_connections_refreshable_expires_at",
+            "expires_at",
+            postgresql_where=text("revoked_at IS NULL AND refresh_token IS NOT NULL"),
+        ),
     )
 
     # --- Helpers ---
@@ -59,7 +74,7 @@ class Connection(Base):
 
     @property
     def is_expired(self) -> bool:
-        return self.expires_at <= datetime.now()
+        return self.expires_at <= utcnow()
 
     def get_scopes_list(self) -> list[str]:
         """Parse scopes JSON string into a list."""
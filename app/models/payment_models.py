@@ -90,7 +90,6 @@ class Subscription(Base):
         UUID(as_uuid=True),
         primary_key=True,
         default=uuid.uuid4,
-        index=True,
         nullable=False,
     )
 
@@ -169,7 +168,6 @@ class Transaction(Base):
         UUID(as_uuid=True),
         primary_key=True,
         default=uuid.uuid4,
-        index=True,
         nullable=False,
     )
 
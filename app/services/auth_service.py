@@ -1,8 +1,11 @@
 import asyncio
+import hashlib
+import time
 from datetime import datetime, timedelta
 from typing import Any
 
 import httpx
+from cachetools import TTLCache
 from fastapi import HTTPException, status
 from jose import jwt
 from jose.exceptions import JWTClaimsError
@@ -10,6 +13,12 @@ from jose.exceptions import JWTClaimsError
 from app.config.logger_config import logger
 from app.config.settings import get_keycloak_openid, get_settings, resolve_ssl_verify
 
+# Validated JWT payloads, keyed by a digest of the token so raw tokens
+# aren't held in memory. A hit is only served until the token's own `exp`;
+# the TTL bounds how long a token revoked in Keycloak keeps working here.
+TOKEN_PAYLOAD_CACHE_TTL_SECONDS = 300
+_token_payloads: TTLCache = TTLCache(maxsize=4096, ttl=TOKEN_PAYLOAD_CACHE_TTL_SECONDS)
+
 
 class AuthService:
     """
@@ -63,6 +72,11 @@ class AuthService:
         Raises:
             HTTPException: If the token is invalid
         """
+        cache_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+        cached = _token_payloads.get(cache_key)
+        if cached is not None and cached[1] > time.time():
+            return cached[0]
+
         try:
             public_key = await self._get_public_key()
 
@@ -93,6 +107,9 @@ class AuthService:
                         headers={"WWW-Authenticate": "Bearer"},
                     )
 
+                exp = payload.get("exp")
+                if isinstance(exp, int | float):
+                    _token_payloads[cache_key] = (payload, exp)
                 return payload
 
             except JWTClaimsError as e:
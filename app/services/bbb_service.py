@@ -6,6 +6,7 @@ from urllib.parse import urlencode
 from uuid import UUID
 
 import requests
+from cachetools import TTLCache
 from fastapi import HTTPException
 from fastapi.responses import RedirectResponse
 from sqlalchemy import delete, select, update  # noqa: F401
@@ -25,6 +26,24 @@ from app.models.bbb_schemas import (
 from app.models.event.event_models import Event
 from app.utils.bbb_helpers import generate_checksum, parse_xml_response
 
+# meeting_id -> owner user id, for the broadcaster/plugin endpoints that
+# only need the owner. The owner never changes; entries are dropped when a
+# meeting ends or is deleted (directly or with its owner), and the TTL
+# bounds staleness on other workers.
+MEETING_OWNER_TTL_SECONDS = 30
+_meeting_owners: TTLCache = TTLCache(maxsize=1024, ttl=MEETING_OWNER_TTL_SECONDS)
+
+
+def forget_meeting_owner(meeting_id: str) -> None:
+    _meeting_owners.pop(meeting_id, None)
+
+
+def forget_meetings_owned_by(user_id) -> None:
+    """Drop every cached meeting owned by the user (e.g. on account deletion)."""
+    owner = str(user_id)
+    for meeting_id in [m for m, o in list(_meeting_owners.items()) if o == owner]:
+        _meeting_owners.pop(meeting_id, None)
+
 
 class BBBService:
     def __init__(self):
@@ -178,6 +197,7 @@ class BBBService:
                 meeting.has_been_forcibly_ended = "true"
                 await db.commit()
                 logger.info(f"Meeting ended and database updated: {request.meeting_id}")
+            forget_meeting_owner(request.meeting_id)
 
         return response
 
@@ -267,6 +287,17 @@ class BBBService:
             logger.error(f"Error fetching meeting by internal ID: {e}")
             return None
 
+    async def get_meeting_owner_id(self, meeting_id: str, db: AsyncSession) -> str | None:
+        """Return the id of the user who owns the meeting, or None if it doesn't exist."""
+        owner = _meeting_owners.get(meeting_id)
+        if owner is None:
+            result = await db.execute(select(BbbMeeting.user_id).where(BbbMeeting.meeting_id == meeting_id).limit(1))
+            user_id = result.scalar_one_or_none()
+            if user_id is None:
+                return None
+            owner = _meeting_owners[meeting_id] = str(user_id)
+        return owner
+
     async def update_meeting_status(
         self,
         meeting_id: str,
@@ -288,6 +319,7 @@ class BBBService:
             if is_ended:
                 meeting.has_been_forcibly_ended = "true"
                 await db.commit()
+                forget_meeting_owner(meeting_id)
                 logger.info(f"Meeting marked as ended via callback: {meeting_id}")
                 return {"success": True}
 
@@ -309,6 +341,7 @@ class BBBService:
                     # Meeting has likely ended
                     meeting.has_been_forcibly_ended = "true"
                     await db.commit()
+                    forget_meeting_owner(meeting_id)
                     logger.info(f"Meeting not found in BBB, marked as ended: {meeting_id}")
                     return {
                         "success": True,
@@ -416,6 +449,7 @@ class BBBService:
             count = 0
             for meeting in meetings:
                 # Delete the meeting from the database
+                forget_meeting_owner(meeting.meeting_id)
                 await db.delete(meeting)
                 count += 1
 
@@ -1,7 +1,10 @@
+import asyncio
 import logging
+import uuid
 from collections import defaultdict
 from typing import Any
 
+import orjson
 import requests
 from fastapi import HTTPException
 from fastapi.concurrency import run_in_threadpool
@@ -34,12 +37,10 @@ _STREAM_TTL = 86400  # 24 hours
 async def _record_stream_session_start(user_id: str, stream_id: str, platform: str | None) -> None:
     """Best-effort persistence of stream start for admin analytics."""
     try:
-        import uuid as _uuid
-
         async with SessionLocal() as db:
             session = StreamSession(
                 stream_id=stream_id,
-                user_id=_uuid.UUID(user_id),
+                user_id=uuid.UUID(user_id),
                 platform=platform,
                 status=StreamSessionStatus.ACTIVE.value,
             )
@@ -77,9 +78,15 @@ class StreamTracker:
     @staticmethod
     async def add_stream(user_id: str, stream_id: str, platform: str | None = None) -> None:
         """Register a new active stream"""
-        # Persist to DB for historical analytics (best-effort; Redis remains source of truth)
-        await _record_stream_session_start(user_id, stream_id, platform)
+        # Persist to DB for historical analytics (best-effort; Redis remains source of truth).
+        # Independent of the Redis write, so the two round trips overlap.
+        await asyncio.gather(
+            _record_stream_session_start(user_id, stream_id, platform),
+            StreamTracker._track_stream(user_id, stream_id, platform),
+        )
 
+    @staticmethod
+    async def _track_stream(user_id: str, stream_id: str, platform: str | None) -> None:
         try:
             if cache.redis_client:
                 await cache.sadd(f"streams:user:{user_id}", stream_id)
@@ -100,9 +107,15 @@ class StreamTracker:
     @staticmethod
     async def remove_stream(stream_id: str) -> tuple[str | None, str | None]:
         """Remove a stream, returns (user_id, platform)"""
-        # Mark session as ended in DB (best-effort)
-        await _record_stream_session_end(stream_id)
+        # Mark session as ended in DB (best-effort), alongside the Redis cleanup
+        _, removed = await asyncio.gather(
+            _record_stream_session_end(stream_id),
+            StreamTracker._untrack_stream(stream_id),
+        )
+        return removed
 
+    @staticmethod
+    async def _untrack_stream(stream_id: str) -> tuple[str | None, str | None]:
         user_id = None
         platform = None
 
@@ -136,6 +149,14 @@ class StreamTracker:
                 del StreamTracker._fallback_user_streams[user_id]
         return user_id, platform
 
+    @staticmethod
+    async def get_all_streams() -> list[str]:
+        """Get the IDs of every tracked stream, across all users"""
+        if cache.redis_client:
+            keys = await cache.scan_keys("streams:stream_to_user:*")
+            return [key.removeprefix("streams:stream_to_user:") for key in keys]
+        return list(StreamTracker._fallback_stream_to_user)
+
     @staticmethod
     async def get_active_stream_count(user_id: str) -> int:
         """Get count of active streams for a user"""
@@ -210,7 +231,11 @@ class BroadcasterService:
             if not user:
                 raise HTTPException(status_code=404, detail="User not found")
 
-            subscription = await PaymentService.get_user_subscription(user, db)
+            # Subscription (DB) and active stream count (Redis) don't depend on each other
+            subscription, active_stream_count = await asyncio.gather(
+                PaymentService.get_user_subscription(user, db),
+                StreamTracker.get_active_stream_count(user_id),
+            )
             if not subscription:
                 subscription = await PaymentService.create_free_subscription(user, db)
 
@@ -227,7 +252,6 @@ class BroadcasterService:
             )
 
             # Concurrent stream check via StreamTracker
-            active_stream_count = await StreamTracker.get_active_stream_count(user_id)
             if max_concurrent_streams is not None and active_stream_count >= max_concurrent_streams:
                 raise HTTPException(
                     status_code=403,
@@ -285,7 +309,7 @@ class BroadcasterService:
                     detail=f"Broadcaster error ({response.status_code}): {response.text}",
                 )
 
-            data = response.json()
+            data = orjson.loads(response.content)
             stream_id = data.get("stream_id")
             if not stream_id:
                 raise HTTPException(status_code=502, detail="Broadcaster response missing stream_id")
@@ -339,7 +363,7 @@ class BroadcasterService:
         try:
             response = await run_in_threadpool(do_get)
             response.raise_for_status()
-            return response.json()
+            return orjson.loads(response.content)
         except RequestsTimeout:
             raise HTTPException(status_code=504, detail="Broadcaster status check timed out")
 
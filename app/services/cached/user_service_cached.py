@@ -1,6 +1,6 @@
 from uuid import UUID
 
-from sqlalchemy import select, update
+from sqlalchemy import bindparam, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config.logger_config import get_logger
@@ -11,6 +11,11 @@ from app.models.user_models import User
 logger = get_logger("UserServiceCached")
 settings = get_settings()
 
+# Every authenticated request resolves its user through one of these on a
+# cache miss; built once so SQLAlchemy's compiled cache hits from the start.
+_USER_BY_ID_STMT = select(User).where(User.id == bindparam("user_id")).limit(1)
+_USER_BY_KEYCLOAK_ID_STMT = select(User).where(User.keycloak_id == bindparam("keycloak_id")).limit(1)
+
 
 class UserServiceCached:
     """Cached user service for optimized user operations"""
@@ -18,15 +23,13 @@ class UserServiceCached:
     @cached_db(ttl=settings.cache_ttl_user, key_prefix="user_profile")  # 15 minutes
     async def get_user_by_id_cached(self, user_id: UUID, db: AsyncSession) -> User | None:
         """Get user by ID with caching"""
-        stmt = select(User).where(User.id == user_id)
-        res = await db.execute(stmt)
+        res = await db.execute(_USER_BY_ID_STMT, {"user_id": user_id})
         return res.scalars().first()
 
     @cached_db(ttl=settings.cache_ttl_user, key_prefix="user_keycloak")  # 15 minutes
     async def get_user_by_keycloak_id_cached(self, keycloak_id: str, db: AsyncSession) -> User | None:
         """Get user by Keycloak ID with caching"""
-        stmt = select(User).where(User.keycloak_id == keycloak_id)
-        res = await db.execute(stmt)
+        res = await db.execute(_USER_BY_KEYCLOAK_ID_STMT, {"keycloak_id": keycloak_id})
         return res.scalars().first()
 
     @cached_db(ttl=settings.cache_ttl_long, key_prefix="user_roles")  # 30 minutes - roles change less frequently
@@ -45,7 +48,7 @@ class UserServiceCached:
     async def invalidate_user_cache(self, user_id: UUID, keycloak_id: str | None = None):
         """Invalidate all caches for a specific user.
 
-        ``cached_db`` builds keys as ``{prefix}:{func_name}:{md5(args)}`` —
+        ``cached_db`` builds keys as ``{prefix}:{func_name}:{hash(args)}`` —
         the user_id / keycloak_id never appears literally in the key, so a
         substring pattern like ``user_profile:*<user_id>*`` matches nothing.
         Dropping the whole prefix is the only correct option. With a small
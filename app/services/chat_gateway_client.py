@@ -8,11 +8,15 @@ logger = logging.getLogger("ChatGatewayClient")
 CHAT_GATEWAY_URL = os.getenv("CHAT_GATEWAY_URL", "http://localhost:8081")
 SHARED_SECRET = os.getenv("CHAT_GATEWAY_SHARED_SECRET", "dev-secret")
 
+_PLATFORM_NAMES = {"twitch": "Twitch", "youtube": "YouTube"}
+
 
 class ChatGatewayClient:
     def __init__(self) -> None:
         self.base_url = CHAT_GATEWAY_URL
         self.secret = SHARED_SECRET
+        self._auth_headers = {"X-Internal-Auth": self.secret}
+        self._http: httpx.AsyncClient | None = None
         logger.info(f"[Gateway Client] Initialized with base_url: {self.base_url}")
 
     async def forward_message(
@@ -27,100 +31,88 @@ class ChatGatewayClient:
         url = f"{self.base_url}/messages/incoming"
 
         try:
-            async with httpx.AsyncClient(timeout=5, verify=False) as client:
-                await client.post(
-                    url,
-                    json={
-                        "platform": platform,
-                        "user_id": user_id,
-                        "user_name": username,
-                        "content": message,
-                        "message_id": message_id,
-                    },
-                )
-                logger.debug(f"[Gateway] Forwarded {platform} message from {username}")
+            await self._http_client().post(
+                url,
+                json={
+                    "platform": platform,
+                    "user_id": user_id,
+                    "user_name": username,
+                    "content": message,
+                    "message_id": message_id,
+                },
+                timeout=5,
+            )
+            logger.debug(f"[Gateway] Forwarded {platform} message from {username}")
         except Exception as e:
             logger.error(f"[Gateway] Failed to forward message: {e}")
 
+    def _http_client(self) -> httpx.AsyncClient:
+        """Keep-alive client for all gateway calls, created on first use."""
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                timeout=10,
+                verify=False,
+                limits=httpx.Limits(max_keepalive_connections=10, keepalive_expiry=30),
+            )
+        return self._http
+
+    async def close(self) -> None:
+        """Close the shared HTTP client."""
+        http, self._http = self._http, None
+        if http is not None:
+            await http.aclose()
+
     async def connect_twitch(self, user_id: str, meeting_id: str | None = None) -> None:
         """Start Twitch IRC connection for user"""
-        url = f"{self.base_url}/platforms/twitch/connect"
-        headers = {"X-Internal-Auth": self.secret}
-
-        logger.info(f"[Gateway Client] Calling {url} with user_id={user_id}, meeting_id={meeting_id}")
-
-        try:
-            async with httpx.AsyncClient(timeout=10, verify=False) as client:
-                response = await client.post(
-                    url,
-                    params={"user_id": user_id, "meeting_id": meeting_id},
-                    headers=headers,
-                )
-                logger.info(f"[Gateway Client] Response status: {response.status_code}")
-                response.raise_for_status()
-                logger.info(f"[Gateway] ✅ Started Twitch for user {user_id}")
-        except Exception as e:
-            logger.error(f"[Gateway] ❌ Failed to start Twitch: {e}")
-            raise
+        await self._connect_platform("twitch", user_id, meeting_id)
 
     async def disconnect_twitch(self, user_id: str) -> None:
         """Stop Twitch IRC connection for user"""
-        url = f"{self.base_url}/platforms/twitch/disconnect"
-        headers = {"X-Internal-Auth": self.secret}
-
-        logger.info(f"[Gateway Client] Disconnecting Twitch for user {user_id}")
-
-        try:
-            async with httpx.AsyncClient(timeout=10, verify=False) as client:
-                response = await client.post(
-                    url,
-                    params={"user_id": user_id},
-                    headers=headers,
-                )
-                response.raise_for_status()
-                logger.info(f"[Gateway] ✅ Stopped Twitch for user {user_id}")
-        except Exception as e:
-            logger.error(f"[Gateway] Failed to stop Twitch: {e}")
+        await self._disconnect_platform("twitch", user_id)
 
     async def connect_youtube(self, user_id: str, meeting_id: str | None = None) -> None:
         """Start YouTube polling for user"""
-        url = f"{self.base_url}/platforms/youtube/connect"
-        headers = {"X-Internal-Auth": self.secret}
+        await self._connect_platform("youtube", user_id, meeting_id)
+
+    async def disconnect_youtube(self, user_id: str) -> None:
+        """Stop YouTube polling for user"""
+        await self._disconnect_platform("youtube", user_id)
+
+    async def _connect_platform(self, platform: str, user_id: str, meeting_id: str | None) -> None:
+        url = f"{self.base_url}/platforms/{platform}/connect"
+        name = _PLATFORM_NAMES[platform]
 
         logger.info(f"[Gateway Client] Calling {url} with user_id={user_id}, meeting_id={meeting_id}")
 
         try:
-            async with httpx.AsyncClient(timeout=10, verify=False) as client:
-                response = await client.post(
-                    url,
-                    params={"user_id": user_id, "meeting_id": meeting_id},
-                    headers=headers,
-                )
-                logger.info(f"[Gateway Client] Response status: {response.status_code}")
-                response.raise_for_status()
-                logger.info(f"[Gateway] ✅ Started YouTube for user {user_id}")
+            response = await self._http_client().post(
+                url,
+                params={"user_id": user_id, "meeting_id": meeting_id},
+                headers=self._auth_headers,
+            )
+            logger.info(f"[Gateway Client] Response status: {response.status_code}")
+            response.raise_for_status()
+            logger.info(f"[Gateway] ✅ Started {name} for user {user_id}")
         except Exception as e:
-            logger.error(f"[Gateway] ❌ Failed to start YouTube: {e}")
+            logger.error(f"[Gateway] ❌ Failed to start {name}: {e}")
             raise
 
-    async def disconnect_youtube(self, user_id: str) -> None:
-        """Stop YouTube polling for user"""
-        url = f"{self.base_url}/platforms/youtube/disconnect"
-        headers = {"X-Internal-Auth": self.secret}
+    async def _disconnect_platform(self, platform: str, user_id: str) -> None:
+        url = f"{self.base_url}/platforms/{platform}/disconnect"
+        name = _PLATFORM_NAMES[platform]
 
-        logger.info(f"[Gateway Client] Disconnecting YouTube for user {user_id}")
+        logger.info(f"[Gateway Client] Disconnecting {name} for user {user_id}")
 
         try:
-            async with httpx.AsyncClient(timeout=10, verify=False) as client:
-                response = await client.post(
-                    url,
-                    params={"user_id": user_id},
-                    headers=headers,
-                )
-                response.raise_for_status()
-                logger.info(f"[Gateway] ✅ Stopped YouTube for user {user_id}")
+            response = await self._http_client().post(
+                url,
+                params={"user_id": user_id},
+                headers=self._auth_headers,
+            )
+            response.raise_for_status()
+            logger.info(f"[Gateway] ✅ Stopped {name} for user {user_id}")
         except Exception as e:
-            logger.error(f"[Gateway] Failed to stop YouTube: {e}")
+            logger.error(f"[Gateway] Failed to stop {name}: {e}")
 
 
 chat_gateway_client = ChatGatewayClient()
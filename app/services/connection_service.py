@@ -5,14 +5,22 @@ Handles token encryption/decryption, automatic refresh, and CRUD operations
 against the unified `connections` table.
 """
 
+import asyncio
 import json
 import logging
+import time
+import weakref
 from datetime import datetime, timedelta
 
-from sqlalchemy import select, update
+import httpx
+from cachetools import TTLCache
+from sqlalchemy import bindparam, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config.database.session import SessionLocal
+from app.config.redis_config import cache
 from app.models.connection_model import Connection
+from app.utils.datetime_utils import utcnow
 from app.utils.token_encryption import decrypt_token, encrypt_token
 
 logger = logging.getLogger(__name__)
@@ -20,6 +28,175 @@ logger = logging.getLogger(__name__)
 # Refresh the token if it expires within this many seconds
 REFRESH_THRESHOLD_SECONDS = 300  # 5 minutes
 
+# A cached token this close to expiry is still served, but also refreshed
+# in the background so callers never wait on the provider inline
+REFRESH_AHEAD_SECONDS = 2 * REFRESH_THRESHOLD_SECONDS
+_refresh_ahead_tasks: dict[tuple[str, str], asyncio.Task] = {}
+
+# get_valid_token results per (user_id, provider), so the gateway's token
+# fetches don't cost a SELECT + decrypt each time. Entries are dropped on
+# save/refresh/revoke in this worker. A revoke also leaves a Redis tombstone
+# for one TTL, checked on every hit, so other workers drop theirs too.
+TOKEN_CACHE_TTL_SECONDS = 60
+_token_cache: TTLCache = TTLCache(maxsize=1024, ttl=TOKEN_CACHE_TTL_SECONDS)
+_token_fill_locks: "weakref.WeakValueDictionary[tuple[str, str], asyncio.Lock]" = weakref.WeakValueDictionary()
+
+# (user_id, provider) pairs with no active connection. The gateway polls
+# for users who never connected a platform; this answers those repeats
+# without a query. Kept in Redis so a save on any worker clears it for all
+# of them (the gateway's next fetch may land elsewhere); without Redis,
+# misses aren't cached at all.
+MISSING_TOKEN_TTL_SECONDS = 10
+
+# One in-flight refresh per connection: concurrent refreshers (lazy reads,
+# the background job) wait for the first instead of each spending the
+# refresh token. A failed refresh is not retried for this long, or for as
+# long as the provider's Retry-After asks (capped) when it throttles us.
+REFRESH_BACKOFF_SECONDS = 60
+REFRESH_BACKOFF_MAX_SECONDS = 3600
+_refresh_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+# connection id -> time.monotonic() deadline
+_refresh_backoff: TTLCache = TTLCache(maxsize=1024, ttl=REFRESH_BACKOFF_MAX_SECONDS)
+
+
+# Hot-path lookups, built once so SQLAlchemy's compiled cache hits from the
+# first call. Only the newest row is used, so LIMIT 1 lets the DB stop early.
+_ACTIVE_CONNECTION_STMT = (
+    select(Connection)
+    .where(
+        Connection.user_id == bindparam("user_id"),
+        Connection.provider == bindparam("provider"),
+        Connection.revoked_at.is_(None),
+    )
+    .order_by(Connection.created_at.desc())
+    .limit(1)
+)
+# get_decrypted_token only reads the token columns; selecting just those
+# skips ORM hydration and identity-map bookkeeping for the row.
+_ACTIVE_TOKEN_COLUMNS_STMT = _ACTIVE_CONNECTION_STMT.with_only_columns(
+    Connection.access_token,
+    Connection.refresh_token,
+    Connection.expires_at,
+)
+_ACTIVE_TOKEN_COLUMNS_FOR_ACCOUNT_STMT = _ACTIVE_TOKEN_COLUMNS_STMT.where(
+    Connection.provider_user_id == bindparam("provider_user_id"),
+)
+
+
+def _cached_token(cache_key: tuple[str, str]) -> tuple[dict, float] | None:
+    """A copy of the cached token and its seconds to expiry, unless it's
+    missing or due for refresh.
+
+    Entries hold a time.monotonic() expiry deadline, so a hit is a float
+    compare rather than datetime arithmetic.
+    """
+    cached = _token_cache.get(cache_key)
+    if cached is None:
+        return None
+    token, expires_mono = cached
+    time_left = expires_mono - time.monotonic()
+    if time_left < REFRESH_THRESHOLD_SECONDS:
+        return None
+    return dict(token), time_left
+
+
+def _cache_token(connection: Connection, cache_key: tuple[str, str], now: datetime) -> dict:
+    """Decrypt the connection's token, cache it and return a copy."""
+    token = {
+        "access_token": decrypt_token(connection.access_token),
+        "refresh_token": decrypt_token(connection.refresh_token) if connection.refresh_token else None,
+        "expires_at": connection.expires_at.isoformat(),
+        "provider_user_id": connection.provider_user_id,
+    }
+    _token_cache[cache_key] = (token, time.monotonic() + (connection.expires_at - now).total_seconds())
+    return dict(token)
+
+
+def _backing_off(key: str) -> bool:
+    until = _refresh_backoff.get(key)
+    return until is not None and until > time.monotonic()
+
+
+def _refresh_backoff_seconds(exc: Exception) -> float:
+    """How long to hold off after a failed refresh, honoring Retry-After."""
+    if isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code in (429, 503):
+        try:
+            retry_after = float(exc.response.headers["Retry-After"])
+        except (KeyError, ValueError):
+            return REFRESH_BACKOFF_SECONDS
+        return min(REFRESH_BACKOFF_MAX_SECONDS, max(REFRESH_BACKOFF_SECONDS, retry_after))
+    return REFRESH_BACKOFF_SECONDS
+
+
+def _forget_token(user_id, provider: str) -> None:
+    _token_cache.pop((str(user_id), provider), None)
+
+
+def _flag_key(kind: str, cache_key: tuple[str, str]) -> str:
+    return f"tokens:{kind}:{cache_key[0]}:{cache_key[1]}"
+
+
+async def _flagged(kind: str, cache_keys: list[tuple[str, str]]) -> set[tuple[str, str]]:
+    """The subset of keys with a live ``kind`` flag in Redis."""
+    if not cache.redis_client or not cache_keys:
+        return set()
+    try:
+        values = await cache.redis_client.mget([_flag_key(kind, k) for k in cache_keys])
+    except Exception as e:
+        logger.warning(f"Redis {kind}-token lookup failed: {e}")
+        return set()
+    return {key for key, value in zip(cache_keys, values, strict=True) if value is not None}
+
+
+async def _flag(kind: str, cache_keys: list[tuple[str, str]], ttl: int) -> None:
+    if not cache.redis_client or not cache_keys:
+        return
+    try:
+        async with cache.redis_client.pipeline(transaction=False) as pipe:
+            for key in cache_keys:
+                pipe.set(_flag_key(kind, key), b"1", ex=ttl)
+            await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Redis {kind}-token write failed: {e}")
+
+
+async def _missing_tokens(cache_keys: list[tuple[str, str]]) -> set[tuple[str, str]]:
+    """The subset of keys recently seen without an active connection."""
+    return await _flagged("missing", cache_keys)
+
+
+async def _remember_missing(cache_keys: list[tuple[str, str]]) -> None:
+    await _flag("missing", cache_keys, MISSING_TOKEN_TTL_SECONDS)
+
+
+async def _clear_missing(user_id, provider: str) -> None:
+    if not cache.redis_client:
+        return
+    try:
+        await cache.redis_client.delete(_flag_key("missing", (str(user_id), provider)))
+    except Exception as e:
+        logger.warning(f"Redis missing-token clear failed: {e}")
+
+
+async def _mark_revoked(user_id, provider: str) -> None:
+    """Drop the cached token here and tell other workers to drop theirs."""
+    _forget_token(user_id, provider)
+    await _flag("revoked", [(str(user_id), provider)], TOKEN_CACHE_TTL_SECONDS)
+
+
+async def _drop_revoked(cache_keys: list[tuple[str, str]]) -> set[tuple[str, str]]:
+    """Evict cache hits revoked on another worker; returns the evicted keys."""
+    revoked = await _flagged("revoked", cache_keys)
+    for key in revoked:
+        _token_cache.pop(key, None)
+    return revoked
+
+
+def _notify_refresher(expires_at: datetime) -> None:
+    from app.services.token_refresh_service import TokenRefreshService
+
+    TokenRefreshService.bring_forward(expires_at)
+
 
 async def _refresh_twitch(refresh_token: str) -> dict:
     from app.config.twitch_auth import TwitchAuth
@@ -72,7 +249,7 @@ class ConnectionService:
     ) -> Connection:
         """Create or update a platform connection (upsert)."""
 
-        now = datetime.now()
+        now = utcnow()
         expires_at = now + timedelta(seconds=token_data.get("expires_in", 3600))
 
         encrypted_access = encrypt_token(token_data["access_token"])
@@ -88,7 +265,7 @@ class ConnectionService:
         if provider_user_id is not None:
             conditions.append(Connection.provider_user_id == provider_user_id)
 
-        stmt = select(Connection).where(*conditions).order_by(Connection.created_at.desc())
+        stmt = select(Connection).where(*conditions).order_by(Connection.created_at.desc()).limit(1)
         result = await db.execute(stmt)
         existing = result.scalars().first()
 
@@ -105,6 +282,9 @@ class ConnectionService:
             if display_name is not None:
                 existing.display_name = display_name
             await db.commit()
+            _forget_token(user_id, provider)
+            await _clear_missing(user_id, provider)
+            _notify_refresher(expires_at)
             logger.info(f"[{provider}] Connection updated for user {user_id}")
             return existing
 
@@ -121,6 +301,9 @@ class ConnectionService:
         )
         db.add(connection)
         await db.commit()
+        _forget_token(user_id, provider)
+        await _clear_missing(user_id, provider)
+        _notify_refresher(expires_at)
 
         logger.info(f"[{provider}] Connection created for user {user_id}")
         return connection
@@ -133,16 +316,7 @@ class ConnectionService:
         provider: str,
     ) -> Connection | None:
         """Return the active (non-revoked) connection for a user + provider."""
-        stmt = (
-            select(Connection)
-            .where(
-                Connection.user_id == user_id,
-                Connection.provider == provider,
-                Connection.revoked_at.is_(None),
-            )
-            .order_by(Connection.created_at.desc())
-        )
-        result = await db.execute(stmt)
+        result = await db.execute(_ACTIVE_CONNECTION_STMT, {"user_id": user_id, "provider": provider})
         return result.scalars().first()
 
     @classmethod
@@ -153,7 +327,8 @@ class ConnectionService:
     ) -> bool:
         """Refresh a connection's access token using its refresh token.
 
-        Updates the connection in-place and commits to DB.
+        Updates the connection in-place and commits to DB. Concurrent calls
+        for the same connection collapse into one provider request.
         Returns True on success, False on failure.
         """
         provider = connection.provider
@@ -168,21 +343,46 @@ class ConnectionService:
             logger.warning(f"[{provider}] No refresher registered for provider")
             return False
 
+        key = str(connection.id)
+        if _backing_off(key):
+            logger.debug(f"[{provider}] Refresh for user {user_id} backing off after a recent failure")
+            return False
+
+        seen_expires_at = connection.expires_at
+        async with _refresh_locks.setdefault(key, asyncio.Lock()):
+            # The caller's row may be stale: another request or worker could
+            # have refreshed (and rotated the refresh token) since it was read.
+            # populate_existing overwrites in place; db.refresh would expire the
+            # row under concurrent callers sharing this session.
+            await db.execute(
+                select(Connection).where(Connection.id == connection.id).execution_options(populate_existing=True)
+            )
+            if connection.expires_at != seen_expires_at:
+                return True
+            if _backing_off(key) or not connection.refresh_token:
+                return False
+            return await cls._do_refresh(db, connection, refresher, key, connection.refresh_token)
+
+    @classmethod
+    async def _do_refresh(cls, db: AsyncSession, connection: Connection, refresher, key: str, refresh_token: str) -> bool:
+        provider = connection.provider
+        user_id = connection.user_id
         try:
-            decrypted_refresh = decrypt_token(connection.refresh_token)
-            token_data = await refresher(decrypted_refresh)
+            token_data = await refresher(decrypt_token(refresh_token))
 
-            now = datetime.now()
+            now = utcnow()
             connection.access_token = encrypt_token(token_data["access_token"])
             if token_data.get("refresh_token"):
                 connection.refresh_token = encrypt_token(token_data["refresh_token"])
             connection.expires_at = now + timedelta(seconds=token_data.get("expires_in", 3600))
             connection.updated_at = now
             await db.commit()
+            _forget_token(user_id, provider)
 
             logger.info(f"[{provider}] Token refreshed for user {user_id}")
             return True
         except Exception as e:
+            _refresh_backoff[key] = time.monotonic() + _refresh_backoff_seconds(e)
             logger.error(f"[{provider}] Token refresh failed for user {user_id}: {e}")
             return False
 
@@ -195,13 +395,134 @@ class ConnectionService:
     ) -> dict | None:
         """Return a valid (decrypted) access token, auto-refreshing if needed.
 
-        Returns dict with access_token, refresh_token, expires_at or None.
+        Returns dict with access_token, refresh_token, expires_at and
+        provider_user_id (e.g. the YouTube channel id), or None.
         """
+        cache_key = (str(user_id), provider)
+        hit = _cached_token(cache_key)
+        if hit is not None and not await _drop_revoked([cache_key]):
+            token, time_left = hit
+            if time_left < REFRESH_AHEAD_SECONDS:
+                cls._schedule_refresh_ahead(user_id, provider)
+            return token
+        if await _missing_tokens([cache_key]):
+            return None
+
+        # Concurrent misses for one key (e.g. the gateway reconnecting) wait
+        # for the first lookup to fill the cache instead of each querying.
+        async with _token_fill_locks.setdefault(cache_key, asyncio.Lock()):
+            hit = _cached_token(cache_key)
+            if hit is not None:
+                return hit[0]
+            if await _missing_tokens([cache_key]):
+                return None
+            return await cls._load_valid_token(db, user_id, provider)
+
+    @classmethod
+    def _schedule_refresh_ahead(cls, user_id, provider: str) -> None:
+        """Start a background refresh unless one is already running."""
+        cache_key = (str(user_id), provider)
+        if cache_key in _refresh_ahead_tasks:
+            return
+        task = asyncio.create_task(cls._refresh_ahead(user_id, provider))
+        _refresh_ahead_tasks[cache_key] = task
+        task.add_done_callback(lambda _: _refresh_ahead_tasks.pop(cache_key, None))
+
+    @classmethod
+    async def _refresh_ahead(cls, user_id, provider: str) -> None:
+        # Own session: the caller's request (and its session) is already gone
+        try:
+            async with SessionLocal() as db:
+                connection = await cls.get_active_connection(db, user_id, provider)
+                if not connection or not connection.refresh_token:
+                    return
+                if (connection.expires_at - utcnow()).total_seconds() < REFRESH_AHEAD_SECONDS:
+                    await cls.refresh_connection(db, connection)
+        except Exception as e:
+            logger.error(f"[{provider}] Background token refresh failed for user {user_id}: {e}")
+
+    @classmethod
+    async def get_valid_tokens(
+        cls,
+        db: AsyncSession,
+        user_ids,
+        provider: str,
+    ) -> dict[str, dict]:
+        """Batch form of get_valid_token, keyed by str(user_id).
+
+        Cached tokens are served as-is; the rest are loaded with a single
+        SELECT. Never refreshes inline: a token inside the refresh threshold
+        is handed to the (single-flight) refresh-ahead task and left out,
+        so one call can't turn into N sequential provider round-trips. Users
+        without a usable token are left out of the result.
+        """
+        tokens: dict[str, dict] = {}
+        uncached = []
+        hits: dict[tuple[str, str], tuple] = {}
+        for user_id in dict.fromkeys(user_ids):
+            cache_key = (str(user_id), provider)
+            hit = _cached_token(cache_key)
+            if hit is not None:
+                hits[cache_key] = (user_id, *hit)
+            else:
+                uncached.append(user_id)
+
+        revoked = await _drop_revoked(list(hits))
+        for cache_key, (user_id, token, time_left) in hits.items():
+            if cache_key in revoked:
+                uncached.append(user_id)
+                continue
+            if time_left < REFRESH_AHEAD_SECONDS:
+                cls._schedule_refresh_ahead(user_id, provider)
+            tokens[cache_key[0]] = token
+
+        known_missing = await _missing_tokens([(str(u), provider) for u in uncached])
+        misses = [u for u in uncached if (str(u), provider) not in known_missing]
+
+        if not misses:
+            return tokens
+
+        result = await db.execute(
+            select(Connection)
+            .where(
+                Connection.user_id.in_(misses),
+                Connection.provider == provider,
+                Connection.revoked_at.is_(None),
+            )
+            .order_by(Connection.created_at.desc())
+        )
+        newest: dict[str, Connection] = {}
+        for row in result.scalars():
+            newest.setdefault(str(row.user_id), row)
+
+        now = utcnow()
+        not_found = []
+        for user_id in misses:
+            cache_key = (str(user_id), provider)
+            connection = newest.get(cache_key[0])
+            if connection is None:
+                not_found.append(cache_key)
+                continue
+            if (connection.expires_at - now).total_seconds() < REFRESH_THRESHOLD_SECONDS:
+                if connection.refresh_token:
+                    cls._schedule_refresh_ahead(user_id, provider)
+                continue
+            tokens[cache_key[0]] = _cache_token(connection, cache_key, now)
+        await _remember_missing(not_found)
+        return tokens
+
+    @classmethod
+    async def _load_valid_token(cls, db: AsyncSession, user_id, provider: str) -> dict | None:
+        cache_key = (str(user_id), provider)
         connection = await cls.get_active_connection(db, user_id, provider)
         if not connection:
+            await _remember_missing([cache_key])
             return None
+        return await cls._token_from_connection(db, connection, cache_key)
 
-        now = datetime.now()
+    @classmethod
+    async def _token_from_connection(cls, db: AsyncSession, connection: Connection, cache_key: tuple[str, str]) -> dict | None:
+        now = utcnow()
         time_left = (connection.expires_at - now).total_seconds()
 
         # If token is expired or about to expire, try to refresh (lazy safety net)
@@ -214,11 +535,7 @@ class ConnectionService:
         if connection.expires_at <= now and not connection.refresh_token:
             return None
 
-        return {
-            "access_token": decrypt_token(connection.access_token),
-            "refresh_token": decrypt_token(connection.refresh_token) if connection.refresh_token else None,
-            "expires_at": connection.expires_at.isoformat(),
-        }
+        return _cache_token(connection, cache_key, now)
 
     @classmethod
     async def revoke_connection(
@@ -238,10 +555,11 @@ class ConnectionService:
                 Connection.provider == provider,
                 Connection.revoked_at.is_(None),
             )
-            .values(revoked_at=datetime.now())
+            .values(revoked_at=utcnow())
         )
         result = await db.execute(stmt)
         await db.commit()
+        await _mark_revoked(user_id, provider)
         logger.info(f"[{provider}] Connection revoked for user {user_id} ({result.rowcount} rows)")
         return result.rowcount
 
@@ -264,10 +582,11 @@ class ConnectionService:
                 Connection.provider == provider,
                 Connection.revoked_at.is_(None),
             )
-            .values(revoked_at=datetime.now())
+            .values(revoked_at=utcnow())
         )
         result = await db.execute(stmt)
         await db.commit()
+        await _mark_revoked(user_id, provider)
         logger.info(f"[{provider}] All connections revoked for user {user_id} ({result.rowcount} rows)")
         return result.rowcount
 
@@ -304,25 +623,23 @@ class ConnectionService:
         For providers with provider_user_id (e.g. facebook_page),
         also filter by that.
         """
-        conditions = [
-            Connection.user_id == user_id,
-            Connection.provider == provider,
-            Connection.revoked_at.is_(None),
-        ]
+        params = {"user_id": user_id, "provider": provider}
+        stmt = _ACTIVE_TOKEN_COLUMNS_STMT
         if provider_user_id is not None:
-            conditions.append(Connection.provider_user_id == provider_user_id)
+            params["provider_user_id"] = provider_user_id
+            stmt = _ACTIVE_TOKEN_COLUMNS_FOR_ACCOUNT_STMT
 
-        stmt = select(Connection).where(*conditions).order_by(Connection.created_at.desc())
-        result = await db.execute(stmt)
-        connection = result.scalars().first()
+        result = await db.execute(stmt, params)
+        row = result.first()
 
-        if not connection:
+        if not row:
             return None
 
+        access_token, refresh_token, expires_at = row
         return {
-            "access_token": decrypt_token(connection.access_token),
-            "refresh_token": decrypt_token(connection.refresh_token) if connection.refresh_token else None,
-            "expires_at": connection.expires_at.isoformat(),
+            "access_token": decrypt_token(access_token),
+            "refresh_token": decrypt_token(refresh_token) if refresh_token else None,
+            "expires_at": expires_at.isoformat(),
         }
 
     @classmethod
@@ -343,7 +660,7 @@ class ConnectionService:
                 "error": "No active connection found",
             }
 
-        now = datetime.now()
+        now = utcnow()
         time_until_expiry = connection.expires_at - now
 
         return {
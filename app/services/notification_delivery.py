@@ -13,14 +13,19 @@ backend is responsible for exponential back-off and giving up after
 from __future__ import annotations
 
 import asyncio
+import random
 import smtplib
 from abc import ABC, abstractmethod
 from email.message import EmailMessage
 from typing import Any
 from uuid import UUID
 
+from sqlalchemy import delete, select
+
+from app.config.database.session import SessionLocal
 from app.config.logger_config import get_logger
 from app.config.settings import get_settings
+from app.models.fcm_token_model import FCMToken
 
 logger = get_logger("NotificationDelivery")
 settings = get_settings()
@@ -29,6 +34,12 @@ MAX_RETRIES = 3
 BASE_BACKOFF_SECONDS = 2
 
 
+def _retry_delay(attempt: int) -> float:
+    """Exponential back-off plus up to a second of jitter, so deliveries
+    that failed together (SMTP relay or FCM blip) don't retry in lockstep."""
+    return BASE_BACKOFF_SECONDS**attempt + random.random()
+
+
 # ---------------------------------------------------------------------------
 # Abstract base
 # ---------------------------------------------------------------------------
@@ -76,8 +87,8 @@ class EmailDeliveryBackend(DeliveryBackend):
             except Exception as exc:
                 logger.warning(f"[Email] Attempt {attempt}/{MAX_RETRIES} raised for {recipient_email}: {exc}")
             if attempt < MAX_RETRIES:
-                wait = BASE_BACKOFF_SECONDS**attempt
-                logger.info(f"[Email] Retrying in {wait}s …")
+                wait = _retry_delay(attempt)
+                logger.info(f"[Email] Retrying in {wait:.1f}s …")
                 await asyncio.sleep(wait)
 
         logger.error(f"[Email] Permanently failed for {recipient_email}: {title}")
@@ -157,8 +168,8 @@ class PushDeliveryBackend(DeliveryBackend):
             except Exception as exc:
                 logger.warning(f"[Push] Attempt {attempt}/{MAX_RETRIES} raised for user {user_id}: {exc}")
             if attempt < MAX_RETRIES:
-                wait = BASE_BACKOFF_SECONDS**attempt
-                logger.info(f"[Push] Retrying in {wait}s …")
+                wait = _retry_delay(attempt)
+                logger.info(f"[Push] Retrying in {wait:.1f}s …")
                 await asyncio.sleep(wait)
 
         logger.error(f"[Push] Permanently failed for user {user_id}: {title}")
@@ -230,11 +241,6 @@ class PushDeliveryBackend(DeliveryBackend):
 
     async def _get_user_tokens(self, user_id: UUID) -> list[str]:
         """Fetch all FCM tokens for a user from the database."""
-        from sqlalchemy import select
-
-        from app.config.database.session import SessionLocal
-        from app.models.fcm_token_model import FCMToken
-
         async with SessionLocal() as session:
             stmt = select(FCMToken.token).where(FCMToken.user_id == user_id)
             result = await session.execute(stmt)
@@ -242,11 +248,6 @@ class PushDeliveryBackend(DeliveryBackend):
 
     async def _remove_stale_tokens(self, tokens: list[str]) -> None:
         """Delete tokens that FCM reported as unregistered."""
-        from sqlalchemy import delete
-
-        from app.config.database.session import SessionLocal
-        from app.models.fcm_token_model import FCMToken
-
         async with SessionLocal() as session:
             stmt = delete(FCMToken).where(FCMToken.token.in_(tokens))
             await session.execute(stmt)
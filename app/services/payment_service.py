@@ -8,11 +8,14 @@ from datetime import datetime, timedelta
 from typing import Any
 
 import stripe
+from cachetools import TTLCache
 from fastapi import HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from app.config.logger_config import get_logger
+from app.config.redis_config import cache
 from app.config.settings import get_settings
 from app.models.payment_models import (
     PLAN_LIMITS,
@@ -38,6 +41,16 @@ settings = get_settings()
 # Initialize Stripe
 stripe.api_key = settings.stripe_secret_key
 
+# Webhooks keep subscriptions in sync; the on-read Stripe reconcile is only a
+# fallback, so run it at most once per user per cooldown window
+RECONCILE_COOLDOWN_SECONDS = 60
+_recent_reconciles: TTLCache = TTLCache(maxsize=4096, ttl=RECONCILE_COOLDOWN_SECONDS)
+
+# /subscription and /limits are fetched back-to-back on dashboard load; keep
+# each user's computed limits briefly so the second call skips the DB
+PLAN_LIMITS_CACHE_TTL_SECONDS = 5
+_plan_limits: TTLCache = TTLCache(maxsize=10000, ttl=PLAN_LIMITS_CACHE_TTL_SECONDS)
+
 
 class PaymentService:
     """Service for handling payment operations with Stripe"""
@@ -194,6 +207,46 @@ class PaymentService:
         result = await db.execute(select(Subscription).where(Subscription.user_id == user.id))
         return result.scalar_one_or_none()
 
+    @staticmethod
+    async def get_user_subscription_with_transactions(user: User, db: AsyncSession) -> Subscription | None:
+        """Get user's subscription with its transactions eagerly loaded"""
+        result = await db.execute(
+            select(Subscription).options(selectinload(Subscription.transactions)).where(Subscription.user_id == user.id)
+        )
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    def get_cached_plan_limits(user_id: Any) -> dict[str, Any] | None:
+        """Recently computed plan limits for the user, if any"""
+        limits = _plan_limits.get(str(user_id))
+        return limits.copy() if limits is not None else None
+
+    @staticmethod
+    def cache_plan_limits(user_id: Any, limits: dict[str, Any]) -> None:
+        _plan_limits[str(user_id)] = limits.copy()
+
+    @staticmethod
+    def invalidate_plan_limits(user_id: Any) -> None:
+        _plan_limits.pop(str(user_id), None)
+
+    @staticmethod
+    async def claim_reconcile(user_id: Any) -> bool:
+        """Return True if the caller should reconcile this user with Stripe now.
+
+        Uses a Redis SET NX with expiry so the cooldown is shared across
+        workers, falling back to an in-process cache without Redis.
+        """
+        key = f"reconcile:user:{user_id}"
+        if cache.redis_client:
+            try:
+                return bool(await cache.redis_client.set(key, "1", ex=RECONCILE_COOLDOWN_SECONDS, nx=True))
+            except Exception as e:
+                logger.warning(f"Redis reconcile cooldown failed, using fallback: {e}")
+        if key in _recent_reconciles:
+            return False
+        _recent_reconciles[key] = True
+        return True
+
     @staticmethod
     async def reconcile_subscription_from_stripe(user: User, db: AsyncSession) -> Subscription | None:
         """Reconcile local subscription with Stripe state for the user's customer.
@@ -280,6 +333,7 @@ class PaymentService:
             if changed:
                 await db.commit()
                 await db.refresh(subscription)
+                PaymentService.invalidate_plan_limits(user.id)
                 logger.info(f"Reconciled subscription for user {user.id} from Stripe")
 
             return subscription
@@ -372,6 +426,7 @@ class PaymentService:
 
             await db.commit()
             await db.refresh(subscription)
+            PaymentService.invalidate_plan_limits(user.id)
 
             logger.info(f"Subscription for user {user.id} set to cancel at period end")
             return subscription
@@ -508,6 +563,7 @@ class PaymentService:
             db.add(subscription)
 
         await db.commit()
+        PaymentService.invalidate_plan_limits(subscription.user_id)
         logger.info(f"Subscription created/updated for user {user_id}")
 
     @staticmethod
@@ -540,6 +596,7 @@ class PaymentService:
             subscription.plan = PaymentService._get_plan_from_price_id(price_id)
 
         await db.commit()
+        PaymentService.invalidate_plan_limits(subscription.user_id)
         logger.info(f"Subscription {subscription_id} updated")
 
     @staticmethod
@@ -561,6 +618,7 @@ class PaymentService:
         subscription.canceled_at = utcnow()
 
         await db.commit()
+        PaymentService.invalidate_plan_limits(subscription.user_id)
         logger.info(f"Subscription {subscription_id} deleted")
 
     @staticmethod
@@ -1,44 +1,60 @@
+import asyncio
 import logging
 
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+import requests
 
-from app.models.user_models import User
-from app.services.broadcaster_service import BroadcasterService
-from app.services.chat_context import get_user_streams, remove_user_stream
+from app.services.broadcaster_service import BroadcasterService, StreamTracker
 
 logger = logging.getLogger("StreamCleanupService")
 
+# Status checks in flight at once; each holds a threadpool worker for up
+# to the broadcaster timeout
+CLEANUP_CONCURRENCY = 8
+
 
 class StreamCleanupService:
     """Background service to clean up stale stream entries in Redis"""
 
     @staticmethod
-    async def cleanup_stale_streams(db: AsyncSession):
+    async def cleanup_stale_streams():
         """
-        Check all users' active streams and remove ones that no longer exist in broadcaster
+        Remove tracked streams that no longer exist in broadcaster
         Run this periodically (e.g., every 5 minutes)
+
+        Only the streams StreamTracker has registered are checked, so the
+        cost of a run follows the number of live streams: an idle
+        deployment pays one SCAN rather than a users-table load plus a
+        Redis read per user. Status checks run concurrently, at most
+        CLEANUP_CONCURRENCY at a time.
         """
         try:
-            broadcaster_service = BroadcasterService()
+            stream_ids = await StreamTracker.get_all_streams()
+            if not stream_ids:
+                logger.debug("No tracked streams to check")
+                return
 
-            # Get all users
-            result = await db.execute(select(User))
-            users = result.scalars().all()
-
-            for user in users:
-                user_id = str(user.id)
-                stream_ids = await get_user_streams(user_id)
+            broadcaster_service = BroadcasterService()
+            semaphore = asyncio.Semaphore(CLEANUP_CONCURRENCY)
 
-                for stream_id in stream_ids:
+            async def check(stream_id: str) -> None:
+                async with semaphore:
                     try:
                         # Check if stream still exists
                         await broadcaster_service.fetch_status(stream_id)
-                    except Exception:
-                        # Stream doesn't exist or failed, remove from Redis
-                        await remove_user_stream(stream_id)
+                    except requests.HTTPError as e:
+                        if e.response is None or e.response.status_code != 404:
+                            logger.warning(f"Status check for stream {stream_id} failed, keeping it: {e}")
+                            return
+                        # The broadcaster says it's gone: stop tracking it
+                        user_id, _ = await StreamTracker.remove_stream(stream_id)
                         logger.info(f"Cleaned up stale stream {stream_id} for user {user_id}")
+                    except Exception as e:
+                        # Timeouts / connection errors say nothing about the
+                        # stream; an outage must not wipe every live stream
+                        logger.warning(f"Status check for stream {stream_id} failed, keeping it: {e}")
+
+            await asyncio.gather(*(check(stream_id) for stream_id in stream_ids))
 
-            logger.info("Stream cleanup completed")
+            logger.info(f"Stream cleanup completed ({len(stream_ids)} stream(s) checked)")
         except Exception as e:
             logger.error(f"Stream cleanup error: {e}")
@@ -1,63 +1,156 @@
 """
 Background service to proactively refresh expiring OAuth tokens.
 
-Runs via APScheduler every 30 minutes.  Refreshes any active connection
-whose access token expires within the next 30 minutes, using the
-provider's refresh-token endpoint.
-
-Twitch tokens last ~4 hours, YouTube ~1 hour, so a 30-minute cycle
-gives at least 2 refresh opportunities before any token expires.
+Runs as a one-shot APScheduler job that re-arms itself: after each pass
+it sleeps until the earliest remaining token enters the 30-minute refresh
+window (clamped to [1 min, 6 h]) instead of polling on a fixed interval.
+New connections bring the next run forward if they expire sooner; a
+failed pass retries with jittered exponential backoff.
+
+Twitch tokens last ~4 hours, YouTube ~1 hour; ConnectionService still
+refreshes lazily on read, so this is the proactive half only.
 """
 
 import logging
-from datetime import datetime, timedelta
+import random
+from datetime import UTC, datetime, timedelta
+from typing import Any
 
-from sqlalchemy import select
+from apscheduler.triggers.date import DateTrigger  # type: ignore
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config.database.session import SessionLocal
 from app.models.connection_model import Connection
 from app.services.connection_service import ConnectionService
+from app.utils.datetime_utils import utcnow
 
 logger = logging.getLogger("TokenRefresh")
 
 # Refresh tokens that expire within this window
 BACKGROUND_REFRESH_THRESHOLD_SECONDS = 1800  # 30 minutes
 
+# Bounds on how long the job sleeps between passes
+MIN_REFRESH_SLEEP_SECONDS = 60
+MAX_REFRESH_SLEEP_SECONDS = 6 * 3600
+
+# Retry delay after a failed pass doubles from the base up to the cap,
+# plus up to 50% jitter so workers recovering together don't sync up
+RETRY_BASE_SECONDS = 60
+RETRY_MAX_SECONDS = 30 * 60
+
+TOKEN_REFRESH_JOB_ID = "token_refresh_job"
+
 
 class TokenRefreshService:
     """Proactively refreshes tokens that are about to expire."""
 
+    _scheduler: Any = None
+    _next_refresh_at: datetime | None = None
+    _failures: int = 0
+
     @staticmethod
-    async def refresh_expiring_tokens(db: AsyncSession) -> None:
-        """Scan for active connections expiring soon and refresh them."""
-        threshold = datetime.now() + timedelta(seconds=BACKGROUND_REFRESH_THRESHOLD_SECONDS)
-
-        stmt = (
-            select(Connection)
-            .where(
-                Connection.revoked_at.is_(None),
-                Connection.expires_at <= threshold,
-                Connection.refresh_token.isnot(None),
-            )
-            .order_by(Connection.expires_at.asc())
+    async def refresh_expiring_tokens(db: AsyncSession) -> datetime | None:
+        """Refresh active connections expiring soon.
+
+        Returns the earliest future expiry among refreshable connections
+        after the pass (None if there are none), which decides when to run
+        next. Connections that failed this pass or are already expired are
+        left out, so a dead token can't pin the job to the minimum sleep;
+        they're retried on the next pass and lazily on read.
+        """
+        now = utcnow()
+        threshold = now + timedelta(seconds=BACKGROUND_REFRESH_THRESHOLD_SECONDS)
+        refreshable = (
+            Connection.revoked_at.is_(None),
+            Connection.refresh_token.isnot(None),
         )
+
+        stmt = select(Connection).where(*refreshable, Connection.expires_at <= threshold).order_by(Connection.expires_at.asc())
         result = await db.execute(stmt)
         connections = result.scalars().all()
 
         if not connections:
             logger.debug("[TokenRefresh] No tokens need refreshing")
-            return
-
-        logger.info(f"[TokenRefresh] Found {len(connections)} token(s) to refresh")
+        else:
+            logger.info(f"[TokenRefresh] Found {len(connections)} token(s) to refresh")
 
         success_count = 0
-        fail_count = 0
+        failed_ids = []
 
         for conn in connections:
             ok = await ConnectionService.refresh_connection(db, conn)
             if ok:
                 success_count += 1
             else:
-                fail_count += 1
+                failed_ids.append(conn.id)
 
-        logger.info(f"[TokenRefresh] Refresh complete: {success_count} succeeded, {fail_count} failed")
+        if connections:
+            logger.info(f"[TokenRefresh] Refresh complete: {success_count} succeeded, {len(failed_ids)} failed")
+
+        upcoming = select(func.min(Connection.expires_at)).where(*refreshable, Connection.expires_at > now)
+        if failed_ids:
+            upcoming = upcoming.where(Connection.id.notin_(failed_ids))
+        earliest = await db.execute(upcoming)
+        return earliest.scalar_one_or_none()
+
+    @staticmethod
+    def next_refresh_at(earliest_expiry: datetime | None, now: datetime) -> datetime:
+        """When to run next so the earliest token is caught inside the window."""
+        if earliest_expiry is None:
+            delay = float(MAX_REFRESH_SLEEP_SECONDS)
+        else:
+            delay = (earliest_expiry - now).total_seconds() - BACKGROUND_REFRESH_THRESHOLD_SECONDS
+        delay = min(MAX_REFRESH_SLEEP_SECONDS, max(MIN_REFRESH_SLEEP_SECONDS, delay))
+        return now + timedelta(seconds=delay)
+
+    @staticmethod
+    def retry_delay(failures: int) -> float:
+        """Seconds to wait after `failures` consecutive failed passes."""
+        delay = min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * 2 ** min(failures - 1, 10))
+        return delay + random.uniform(0, delay / 2)
+
+    @classmethod
+    def start(cls, scheduler: Any) -> None:
+        """Attach to the app scheduler and arm the first pass."""
+        cls._scheduler = scheduler
+        cls._schedule(utcnow() + timedelta(seconds=MIN_REFRESH_SLEEP_SECONDS))
+
+    @classmethod
+    def bring_forward(cls, expires_at: datetime) -> None:
+        """Move the next pass earlier if a token expiring at `expires_at`
+        would otherwise miss its refresh window."""
+        if cls._scheduler is None:
+            return
+        when = cls.next_refresh_at(expires_at, utcnow())
+        if cls._next_refresh_at is None or when < cls._next_refresh_at:
+            cls._schedule(when)
+
+    @classmethod
+    async def run(cls) -> None:
+        try:
+            async with SessionLocal() as db:
+                earliest = await cls.refresh_expiring_tokens(db)
+        except Exception as e:
+            cls._failures += 1
+            delay = cls.retry_delay(cls._failures)
+            logger.error(f"[TokenRefresh] Refresh pass failed ({cls._failures} in a row), retrying in {delay:.0f}s: {e}")
+            cls._schedule(utcnow() + timedelta(seconds=delay))
+            return
+        cls._failures = 0
+        cls._schedule(cls.next_refresh_at(earliest, utcnow()))
+
+    @classmethod
+    def _schedule(cls, when: datetime) -> None:
+        # Times here are naive UTC like Connection.expires_at; tag them so
+        # the scheduler doesn't read them as local time
+        cls._next_refresh_at = when
+        cls._scheduler.add_job(
+            cls.run,
+            trigger=DateTrigger(run_date=when.replace(tzinfo=UTC)),
+            id=TOKEN_REFRESH_JOB_ID,
+            name="Token Refresh Job",
+            replace_existing=True,
+            misfire_grace_time=600,  # 10 min grace
+        )
+        logger.debug(f"[TokenRefresh] Next pass at {when.isoformat()}")
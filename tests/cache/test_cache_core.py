@@ -11,21 +11,24 @@ class FakeCache:
         self.store = {}  # key -> (value, expire_at or None)
         self.delete_calls = []
 
-    async def get(self, key: str):
+    async def get(self, key: str, default=None):
         v = self.store.get(key)
         if not v:
-            return None
+            return default
         val, exp = v
         if exp and exp < time.time():
             # expired
             self.store.pop(key, None)
-            return None
+            return default
         return val
 
-    async def set(self, key: str, value, ex: int | None = None):
+    async def set(self, key: str, value, ex: int | None = None, min_bytes: int = 0):
         expire_at = time.time() + ex if ex else None
         self.store[key] = (value, expire_at)
 
+    def set_deferred(self, key, value, ttl, min_bytes=0):
+        return False
+
     async def delete_pattern(self, pattern: str):
         # crude glob: treat '*' as wildcard
         self.delete_calls.append(pattern)
@@ -135,3 +138,105 @@ async def test_cached_db_graceful_on_set_failure(monkeypatch, fake_cache, db_ses
     # Second call -> since set failed earlier, still a miss
     r2 = await sample(10, db_session)
     assert r2 == 9 and calls["count"] == 2
+
+
+@pytest.mark.anyio
+async def test_cached_db_coalesces_concurrent_misses(fake_cache, db_session):
+    calls = {"count": 0}
+
+    @redis_config.cached_db(ttl=30, key_prefix="single_flight")
+    async def sample(a: int, db):
+        calls["count"] += 1
+        await asyncio.sleep(0.05)
+        return {"v": a}
+
+    results = await asyncio.gather(*(sample(4, db_session) for _ in range(5)))
+
+    assert results == [{"v": 4}] * 5
+    assert calls["count"] == 1
+    assert redis_config._inflight == {}
+
+
+@pytest.mark.anyio
+async def test_cached_db_followers_recompute_when_leader_fails(fake_cache, db_session):
+    calls = {"count": 0}
+
+    @redis_config.cached_db(ttl=30, key_prefix="single_flight_err")
+    async def sample(a: int, db):
+        calls["count"] += 1
+        await asyncio.sleep(0.05)
+        if calls["count"] == 1:
+            raise RuntimeError("leader failed")
+        return a
+
+    results = await asyncio.gather(sample(1, db_session), sample(1, db_session), return_exceptions=True)
+
+    assert isinstance(results[0], RuntimeError)
+    assert results[1] == 1
+    assert redis_config._inflight == {}
+
+
+def test_generate_cache_key_is_stable_and_kwarg_order_independent():
+    k1 = redis_config.generate_cache_key(1, "a", x=1, y=2)
+    k2 = redis_config.generate_cache_key(1, "a", y=2, x=1)
+    assert k1 == k2
+    assert len(k1) == 32
+    assert redis_config.generate_cache_key(1, "a") != redis_config.generate_cache_key(1, "b")
+
+
+@pytest.mark.anyio
+async def test_cached_db_annotated_session_is_excluded_from_key(fake_cache, db_session):
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    calls = {"count": 0}
+
+    @redis_config.cached_db(ttl=30, key_prefix="annotated")
+    async def sample(a: int, db: AsyncSession, b: int = 0):
+        calls["count"] += 1
+        return a + b
+
+    assert await sample(1, db_session, b=2) == 3
+    # Same logical args with the session passed by keyword -> same key
+    assert await sample(1, db=db_session, b=2) == 3
+    assert calls["count"] == 1
+    assert all("AsyncSession" not in k for k in fake_cache.store)
+
+
+@pytest.mark.anyio
+async def test_cached_version_bump_changes_key(fake_cache):
+    def make(version):
+        @redis_config.cached(ttl=30, key_prefix="shape", version=version)
+        async def sample(a):
+            return {"a": a}
+
+        return sample
+
+    await make(1)(1)
+    await make(2)(1)
+
+    keys = sorted(fake_cache.store)
+    assert len(keys) == 2
+    assert keys[0].startswith("shape:v1:sample:")
+    assert keys[1].startswith("shape:v2:sample:")
+
+
+@pytest.mark.anyio
+async def test_cached_skips_none_unless_cache_none(fake_cache):
+    calls = {"plain": 0, "negative": 0}
+
+    @redis_config.cached(ttl=30, key_prefix="none_plain")
+    async def plain(a):
+        calls["plain"] += 1
+        return None
+
+    @redis_config.cached(ttl=30, key_prefix="none_negative", cache_none=True)
+    async def negative(a):
+        calls["negative"] += 1
+        return None
+
+    for _ in range(2):
+        assert await plain(1) is None
+        assert await negative(1) is None
+
+    assert calls == {"plain": 2, "negative": 1}
+    assert not any(k.startswith("none_plain:") for k in fake_cache.store)
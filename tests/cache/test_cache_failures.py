@@ -4,10 +4,13 @@ from app.config import redis_config
 
 
 class FailingCache:
-    async def get(self, key):
+    async def get(self, key, default=None):
         raise RuntimeError("down")
 
-    async def set(self, key, value, ex=None):
+    async def set(self, key, value, ex=None, min_bytes=0):
+        raise RuntimeError("down")
+
+    def set_deferred(self, key, value, ttl, min_bytes=0):
         raise RuntimeError("down")
 
     async def delete_pattern(self, pattern):
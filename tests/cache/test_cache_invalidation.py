@@ -24,12 +24,15 @@ class FakeCacheInvalidate:
         self.patterns = []
         self.data = {}
 
-    async def get(self, key):
-        return self.data.get(key)
+    async def get(self, key, default=None):
+        return self.data.get(key, default)
 
-    async def set(self, key, value, ex=None):
+    async def set(self, key, value, ex=None, min_bytes=0):
         self.data[key] = value
 
+    def set_deferred(self, key, value, ttl, min_bytes=0):
+        return False
+
     async def delete_pattern(self, pattern: str):
         self.patterns.append(pattern)
 
@@ -161,3 +161,43 @@ def test_serialize_rejects_unknown_type():
 
     with pytest.raises(TypeError, match="not cache-serializable"):
         _serialize(Weird())
+
+
+def test_stdlib_json_payloads_still_decode():
+    """Entries written before the orjson switch were stdlib-json encoded;
+    the wire format is unchanged so they must keep decoding."""
+    import json
+
+    uid = uuid4()
+    legacy = json.dumps({"id": {"__t": "uuid", "__v": str(uid)}, "n": [1, 2]}).encode("utf-8")
+    assert _deserialize(legacy) == {"id": uid, "n": [1, 2]}
+
+
+def test_non_string_dict_keys_are_stringified():
+    # Matches stdlib json behaviour rather than raising
+    assert _roundtrip({1: "a", 2: "b"}) == {"1": "a", "2": "b"}
+
+
+def test_bare_primitives_use_raw_tags():
+    assert _serialize("héllo") == "Shéllo".encode()
+    assert _roundtrip("") == ""
+    assert _roundtrip(b"\x00\xff") == b"\x00\xff"
+    assert _roundtrip(bytearray(b"ab")) == b"ab"
+    for n in (0, -1, 2**63 - 1, -(2**63)):
+        assert _serialize(n)[:1] == b"I"
+        assert _roundtrip(n) == n
+    # bool and enums keep going through tagged JSON
+    assert _serialize(True) == b"true"
+    assert _roundtrip(EventStatus.LIVE) is EventStatus.LIVE
+
+
+def test_large_payloads_are_compressed_and_small_ones_are_not():
+    rows = [{"id": i, "name": "channel", "created_at": datetime(2026, 5, 7)} for i in range(200)]
+    packed = _serialize(rows)
+    assert packed[:1] == b"Z"
+    assert _deserialize(packed) == rows
+
+    assert _serialize({"id": 1})[:1] == b"{"
+    big = "x" * 5000
+    assert _serialize(big)[:1] == b"Z"
+    assert _roundtrip(big) == big
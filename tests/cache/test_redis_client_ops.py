@@ -0,0 +1,498 @@
+"""RedisCache methods exercised against an in-memory stand-in for the
+redis.asyncio client, so the command sequence each method issues can be
+asserted without a live server."""
+
+import asyncio
+import fnmatch
+
+import pytest
+
+from app.config import redis_config
+from app.config.redis_config import RedisCache
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.queued: list[tuple] = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        def queue(*args):
+            self.queued.append((name, args))
+            return self
+
+        return queue
+
+    async def execute(self):
+        self.client.commands.append(("EXEC", len(self.queued)))
+        queued, self.queued = self.queued, []
+        return [await getattr(self.client, name)(*args) for name, args in queued]
+
+
+class FakeRedisClient:
+    def __init__(self):
+        self.store: dict[bytes, bytes] = {}
+        self.commands: list[tuple] = []
+
+    async def scan_iter(self, match: str, count: int):
+        self.commands.append(("SCAN", match, count))
+        for k in list(self.store):
+            if fnmatch.fnmatchcase(k.decode(), match):
+                yield k
+
+    async def unlink(self, *keys):
+        self.commands.append(("UNLINK", len(keys)))
+        for k in keys:
+            self.store.pop(k, None)
+        return len(keys)
+
+    async def get(self, key):
+        self.commands.append(("GET", key))
+        return self.store.get(key.encode())
+
+    async def delete(self, *keys):
+        self.commands.append(("DEL", len(keys)))
+        for k in keys:
+            self.store.pop(k.encode(), None)
+        return len(keys)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def setex(self, key, ttl, value):
+        self.commands.append(("SETEX", key, ttl))
+        self.store[key.encode()] = value
+        return True
+
+    async def mget(self, keys):
+        self.commands.append(("MGET", len(keys)))
+        return [self.store.get(k.encode()) for k in keys]
+
+    async def sadd(self, key, *values):
+        self.commands.append(("SADD", len(values)))
+        return len(values)
+
+    async def srem(self, key, *values):
+        self.commands.append(("SREM", len(values)))
+        return len(values)
+
+    async def keys(self, pattern):
+        raise AssertionError("KEYS blocks the server; delete_pattern must SCAN")
+
+    async def aclose(self):
+        self.commands.append(("CLOSE",))
+
+    @property
+    def connection_pool(self):
+        client = self
+
+        class _Pool:
+            async def disconnect(self, inuse_connections=True):
+                client.commands.append(("POOL_DISCONNECT", inuse_connections))
+
+        return _Pool()
+
+
+@pytest.fixture
+def client():
+    return FakeRedisClient()
+
+
+@pytest.fixture
+def rc(client):
+    c = RedisCache()
+    c.redis_client = client  # type: ignore[assignment]
+    return c
+
+
+@pytest.mark.anyio
+async def test_delete_pattern_scans_and_unlinks_matches_only(rc, client):
+    client.store = {b"users_list:a": b"1", b"users_list:b": b"2", b"other:c": b"3"}
+
+    assert await rc.delete_pattern("users_list:*") is True
+
+    assert set(client.store) == {b"other:c"}
+    assert ("UNLINK", 2) in client.commands
+
+
+@pytest.mark.anyio
+async def test_delete_pattern_unlinks_in_bounded_batches(rc, client, monkeypatch):
+    monkeypatch.setattr(redis_config, "_SCAN_BATCH", 3)
+    client.store = {f"k:{i}".encode(): b"v" for i in range(7)}
+
+    await rc.delete_pattern("k:*")
+
+    assert client.store == {}
+    assert [c for c in client.commands if c[0] == "UNLINK"] == [("UNLINK", 3), ("UNLINK", 3), ("UNLINK", 1)]
+    # All three batches went out in a single pipeline round trip
+    assert [c for c in client.commands if c[0] == "EXEC"] == [("EXEC", 3)]
+
+
+@pytest.mark.anyio
+async def test_delete_pattern_flushes_pipeline_every_n_batches(rc, client, monkeypatch):
+    monkeypatch.setattr(redis_config, "_SCAN_BATCH", 2)
+    monkeypatch.setattr(redis_config, "_PIPELINE_FLUSH_BATCHES", 2)
+    client.store = {f"k:{i}".encode(): b"v" for i in range(5)}
+
+    await rc.delete_pattern("k:*")
+
+    assert client.store == {}
+    assert [c for c in client.commands if c[0] == "EXEC"] == [("EXEC", 2), ("EXEC", 1)]
+
+
+@pytest.mark.anyio
+async def test_delete_pattern_no_matches_issues_no_unlink(rc, client):
+    client.store = {b"other:c": b"3"}
+
+    assert await rc.delete_pattern("nothing:*") is True
+    assert not [c for c in client.commands if c[0] == "UNLINK"]
+
+
+@pytest.mark.anyio
+async def test_mset_pipelines_and_mget_roundtrips(rc, client):
+    assert await rc.mset({"a": {"x": 1}, "b": [1, 2]}, ttl=60) is True
+    assert [c for c in client.commands if c[0] == "EXEC"] == [("EXEC", 2)]
+
+    assert await rc.mget(["a", "missing", "b"]) == [{"x": 1}, None, [1, 2]]
+    assert [c for c in client.commands if c[0] == "MGET"] == [("MGET", 3)]
+
+
+@pytest.mark.anyio
+async def test_mget_without_client_returns_misses():
+    assert await RedisCache().mget(["a", "b"]) == [None, None]
+
+
+@pytest.mark.anyio
+async def test_large_sadd_is_chunked_into_one_pipeline(rc, client, monkeypatch):
+    monkeypatch.setattr(redis_config, "_SET_CHUNK", 2)
+
+    assert await rc.sadd("s", "a", "b", "c", "d", "e") == 5
+    assert [c for c in client.commands if c[0] == "SADD"] == [("SADD", 2), ("SADD", 2), ("SADD", 1)]
+    assert [c for c in client.commands if c[0] == "EXEC"] == [("EXEC", 3)]
+
+
+@pytest.mark.anyio
+async def test_small_srem_is_a_single_command(rc, client):
+    assert await rc.srem("s", "a") == 1
+    assert client.commands == [("SREM", 1)]
+
+
+@pytest.mark.anyio
+async def test_get_serves_hot_key_from_l1_without_redis_roundtrip(rc, client):
+    await rc.set("hot", {"n": 1}, ttl=60)
+
+    first = await rc.get("hot")
+    second = await rc.get("hot")
+
+    assert first == second == {"n": 1}
+    assert not [c for c in client.commands if c[0] == "GET"]
+    # Each hit decodes a fresh object, so mutations don't leak between callers
+    first["n"] = 2
+    assert await rc.get("hot") == {"n": 1}
+
+
+@pytest.mark.anyio
+async def test_l1_disabled_falls_through_to_redis(rc, client, monkeypatch):
+    monkeypatch.setattr(redis_config.settings, "cache_l1_ttl", 0)
+    await rc.set("k", 1, ttl=60)
+
+    assert await rc.get("k") == 1
+    assert ("GET", "k") in client.commands
+
+
+@pytest.mark.anyio
+async def test_delete_and_delete_pattern_evict_l1(rc, client):
+    await rc.set("user_profile:1", "a", ttl=60)
+    await rc.set("user_profile:2", "b", ttl=60)
+    await rc.set("other", "c", ttl=60)
+
+    await rc.delete("other")
+    await rc.delete_pattern("user_profile:*")
+
+    assert rc._l1.get("other") is None
+    assert rc._l1.get("user_profile:1") is None
+    assert rc._l1.get("user_profile:2") is None
+    assert await rc.get("user_profile:1") is None
+
+
+@pytest.mark.anyio
+async def test_deferred_sets_flush_in_one_pipeline(rc, client):
+    rc._start_set_flusher()
+    try:
+        assert rc.set_deferred("a", 1, ttl=60) is True
+        assert rc.set_deferred("b", 2, ttl=60) is True
+        # Readable from the L1 before the flush reaches Redis
+        assert await rc.get("a") == 1
+        await asyncio.sleep(redis_config._SET_FLUSH_INTERVAL * 4)
+    finally:
+        await rc.close()
+
+    assert [c for c in client.commands if c[0] == "EXEC"] == [("EXEC", 2)]
+    assert set(client.store) == {b"a", b"b"}
+
+
+@pytest.mark.anyio
+async def test_invalidation_drops_queued_set(rc, client):
+    rc._start_set_flusher()
+    rc.set_deferred("user_profile:1", "stale", ttl=60)
+    rc.set_deferred("other", "kept", ttl=60)
+    await rc.delete_pattern("user_profile:*")
+    await rc.close()
+
+    assert set(client.store) == {b"other"}
+
+
+@pytest.mark.anyio
+async def test_invalidations_are_not_kept_without_pending_sets(rc, client):
+    rc._start_set_flusher()
+    try:
+        for i in range(50):
+            await rc.delete(f"user_profile:{i}")
+        assert rc._invalidations == []
+
+        rc.set_deferred("user_profile:1", "stale", ttl=60)
+        await rc.delete("user_profile:1")
+        assert len(rc._invalidations) == 1
+        await asyncio.sleep(redis_config._SET_FLUSH_INTERVAL * 4)
+        assert rc._invalidations == [] and rc._pending_sets == 0
+    finally:
+        await rc.close()
+
+    assert b"user_profile:1" not in client.store
+
+
+@pytest.mark.anyio
+async def test_keys_shared_with_the_gateway_stay_plain_json(rc, client):
+    await rc.set("chat:meeting:m1:user_id", "u1", ttl=60)
+    await rc.mset({"streams:stream:s1:user_id": "u1", "own": "u1"}, ttl=60)
+
+    assert client.store[b"chat:meeting:m1:user_id"] == b'"u1"'
+    assert client.store[b"streams:stream:s1:user_id"] == b'"u1"'
+    assert client.store[b"own"] == b"Su1"
+    rc._l1.clear()
+    assert await rc.get("chat:meeting:m1:user_id") == "u1"
+
+
+@pytest.mark.anyio
+async def test_set_deferred_without_flusher_asks_for_inline_set(rc):
+    assert rc.set_deferred("a", 1, ttl=60) is False
+
+
+class FakeDeleteStep:
+    """Mimics the delete-pattern Lua step: one bounded SCAN + UNLINK per call."""
+
+    def __init__(self, client, fail=False):
+        self.client = client
+        self.fail = fail
+        self.calls = 0
+
+    async def __call__(self, keys, args):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("NOSCRIPT and EVAL both refused")
+        pattern, count = keys[0], args[1]
+        matches = [k for k in self.client.store if fnmatch.fnmatchcase(k.decode(), pattern)][:count]
+        for k in matches:
+            self.client.store.pop(k)
+        remaining = any(fnmatch.fnmatchcase(k.decode(), pattern) for k in self.client.store)
+        return b"1" if remaining else b"0"
+
+
+@pytest.mark.anyio
+async def test_delete_pattern_uses_server_side_step(rc, client, monkeypatch):
+    monkeypatch.setattr(redis_config, "_SCAN_BATCH", 2)
+    rc._delete_step = step = FakeDeleteStep(client)
+    client.store = {f"k:{i}".encode(): b"v" for i in range(5)} | {b"other": b"v"}
+
+    assert await rc.delete_pattern("k:*") is True
+
+    assert set(client.store) == {b"other"}
+    assert step.calls == 3
+    # Nothing went through the client-side SCAN/UNLINK path
+    assert client.commands == []
+
+
+@pytest.mark.anyio
+async def test_delete_pattern_falls_back_to_scan_when_script_fails(rc, client):
+    rc._delete_step = FakeDeleteStep(client, fail=True)
+    client.store = {b"k:1": b"v", b"other": b"v"}
+
+    assert await rc.delete_pattern("k:*") is True
+
+    assert set(client.store) == {b"other"}
+    assert ("UNLINK", 1) in client.commands
+
+
+def test_bcast_prefixes_drop_overlaps():
+    assert redis_config._bcast_prefixes({"bbb:", "bbb:meetings:", "events_all:", "events_all_x:"}) == [
+        "bbb:",
+        "events_all:",
+        "events_all_x:",
+    ]
+
+
+@pytest.mark.anyio
+async def test_tracking_fills_l1_from_get_and_evicts_on_invalidate(rc, client):
+    rc._tracking = True
+    rc._tracked = ("events_all:",)
+    client.store = {b"events_all:k": redis_config._serialize([1]), b"other": redis_config._serialize(2)}
+
+    assert await rc.get("events_all:k") == [1]
+    assert await rc.get("events_all:k") == [1]
+    assert await rc.get("other") == 2
+    assert await rc.get("other") == 2
+    gets = [c[1] for c in client.commands if c[0] == "GET"]
+    assert gets == ["events_all:k", "other", "other"]
+
+    rc._on_invalidate([b"events_all:k"])
+    assert rc._l1.get("events_all:k") is None
+
+
+@pytest.mark.anyio
+async def test_tracking_skips_l1_fill_when_invalidated_mid_get(rc, client):
+    rc._tracking = True
+    rc._tracked = ("events_all:",)
+    client.store = {b"events_all:k": redis_config._serialize([1])}
+    real_get = client.get
+
+    async def racing_get(key):
+        rc._on_invalidate([key.encode()])
+        return await real_get(key)
+
+    client.get = racing_get
+    assert await rc.get("events_all:k") == [1]
+    assert rc._l1.get("events_all:k") is None
+
+
+@pytest.mark.anyio
+async def test_flush_invalidation_clears_l1(rc):
+    await rc.set("a", 1, ttl=60)
+    rc._on_invalidate(None)
+    assert len(rc._l1) == 0
+
+
+@pytest.mark.anyio
+async def test_set_below_min_bytes_stays_in_l1(rc, client):
+    assert await rc.set("tiny", 1, ttl=60, min_bytes=64) is True
+    assert not [c for c in client.commands if c[0] == "SETEX"]
+    assert await rc.get("tiny") == 1
+
+
+@pytest.mark.anyio
+async def test_get_default_distinguishes_stored_none(rc, client):
+    miss = object()
+    await rc.set("nothing", None, ttl=60)
+    assert await rc.get("nothing", miss) is None
+    assert await rc.get("absent", miss) is miss
+
+
+@pytest.mark.anyio
+async def test_close_disconnects_pool_and_is_idempotent(rc, client):
+    await rc.close()
+    await rc.close()
+
+    assert rc.redis_client is None
+    assert client.commands == [("CLOSE",), ("POOL_DISCONNECT", True)]
+    assert await rc.get("k") is None
+
+
+class _DeadTrackingConn:
+    def __init__(self, **kwargs):
+        pass
+
+    async def connect(self):
+        raise ConnectionError("redis down")
+
+    async def disconnect(self):
+        pass
+
+
+class _DeadTrackingPool:
+    connection_class = _DeadTrackingConn
+    connection_kwargs: dict = {}
+
+
+@pytest.mark.anyio
+async def test_tracking_reconnect_backs_off_exponentially(rc, monkeypatch):
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+        if len(delays) == 8:
+            raise asyncio.CancelledError
+
+    monkeypatch.setattr(redis_config.random, "random", lambda: 0.5)
+    monkeypatch.setattr(redis_config.asyncio, "sleep", fake_sleep)
+    with pytest.raises(asyncio.CancelledError):
+        await rc._track_invalidations(_DeadTrackingPool())
+
+    assert delays == [0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 30.0, 30.0]
+
+
+class _TrackingConn:
+    """Replays a RESP2 tracking session, then drops the connection."""
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.sent: list[tuple] = []
+        self.replies = [
+            7,
+            b"OK",
+            [b"subscribe", b"__redis__:invalidate", 1],
+            [b"message", b"__redis__:invalidate", [b"events_all:k"]],
+            [b"message", b"__redis__:invalidate", None],
+        ]
+
+    async def connect(self):
+        pass
+
+    async def send_command(self, *args):
+        self.sent.append(args)
+
+    async def read_response(self):
+        if not self.replies:
+            raise ConnectionError("connection reset")
+        return self.replies.pop(0)
+
+    async def disconnect(self):
+        pass
+
+
+@pytest.mark.anyio
+async def test_tracking_redirects_invalidations_to_its_own_subscription(rc, monkeypatch):
+    conns: list[_TrackingConn] = []
+
+    class Pool:
+        connection_kwargs = {"socket_timeout": 5}
+
+        @staticmethod
+        def connection_class(**kwargs):
+            conns.append(_TrackingConn(**kwargs))
+            return conns[-1]
+
+    seen = []
+    monkeypatch.setattr(rc, "_on_invalidate", seen.append)
+    monkeypatch.setattr(redis_config, "_tracked_prefixes", {"events_all:"})
+
+    async def stop(delay):
+        raise asyncio.CancelledError
+
+    monkeypatch.setattr(redis_config.asyncio, "sleep", stop)
+    with pytest.raises(asyncio.CancelledError):
+        await rc._track_invalidations(Pool())
+
+    assert conns[0].kwargs == {"socket_timeout": None}
+    assert conns[0].sent == [
+        ("CLIENT", "ID"),
+        ("CLIENT", "TRACKING", "ON", "REDIRECT", 7, "BCAST", "PREFIX", "events_all:"),
+        ("SUBSCRIBE", "__redis__:invalidate"),
+    ]
+    assert seen == [[b"events_all:k"], None]
+    # Dropped connection: tracking is off until the reconnect succeeds
+    assert rc._tracking is False
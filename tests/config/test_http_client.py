@@ -0,0 +1,46 @@
+import asyncio
+
+import pytest
+
+from app.config import http_client
+
+
+@pytest.mark.anyio
+async def test_oauth_client_is_shared_and_recreated_after_close():
+    first = http_client.get_oauth_client()
+    assert http_client.get_oauth_client() is first
+
+    await http_client.close_oauth_client()
+    assert first.is_closed
+
+    second = http_client.get_oauth_client()
+    assert second is not first
+    await http_client.close_oauth_client()
+
+
+def test_oauth_client_is_not_shared_across_event_loops():
+    async def grab():
+        client = http_client.get_oauth_client()
+        assert http_client.get_oauth_client() is client
+        return client
+
+    first = asyncio.run(grab())
+    second = asyncio.run(grab())
+    assert first is not second
+
+
+def test_public_ssl_context_is_built_once():
+    assert http_client.public_ssl_context() is http_client.public_ssl_context()
+
+
+def test_authorization_url_keeps_params_and_fresh_state():
+    from urllib.parse import parse_qs, urlsplit
+
+    first = http_client.authorization_url("https://example.com/auth", client_id="abc", scope="a b")
+    second = http_client.authorization_url("https://example.com/auth", client_id="abc", scope="a b")
+
+    parts = urlsplit(first)
+    query = parse_qs(parts.query)
+    assert f"{parts.scheme}://{parts.netloc}{parts.path}" == "https://example.com/auth"
+    assert query["client_id"] == ["abc"] and query["scope"] == ["a b"]
+    assert query["state"] != parse_qs(urlsplit(second).query)["state"]
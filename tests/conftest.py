@@ -19,6 +19,7 @@ from app.config.database.session import Base, get_db  # noqa: E402
 from app.main import app  # noqa: E402
 from app.models.bbb_models import BbbMeeting
 from app.models.channel.channels_model import Channel
+from app.models.connection_model import Connection
 from app.models.event.event_models import (
     Event,
     EventStatus,  # Import EventStatus
@@ -90,6 +91,7 @@ async def db_session(setup_database):
             await session.execute(RtmpEndpoint.__table__.delete())
             await session.execute(BbbMeeting.__table__.delete())
             await session.execute(Channel.__table__.delete())
+            await session.execute(Connection.__table__.delete())
             await session.execute(User.__table__.delete())
             await session.commit()
 
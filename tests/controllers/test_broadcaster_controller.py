@@ -55,6 +55,10 @@ async def test_bbb_meeting_m1(db_session: AsyncSession, test_user: User):
 @pytest.fixture(autouse=True)
 def mock_broadcaster(monkeypatch):
     from app.controllers import broadcaster_controller
+    from app.services import bbb_service
+
+    # Meeting ids repeat across tests with different owners
+    bbb_service._meeting_owners.clear()
 
     async def fake_start_broadcasting(
         meeting_id,
@@ -630,3 +634,34 @@ class TestBroadcasterController:
         }
         results = await asyncio.gather(*[client.post("/api/bbb/broadcaster", json=payload) for _ in range(3)])
         assert all(r.status_code == 201 for r in results)
+
+    @pytest.mark.asyncio
+    async def test_meeting_owner_lookup_is_cached_until_meeting_ends(
+        self, db_session: AsyncSession, test_user: User, test_bbb_meeting: BbbMeeting
+    ):
+        from app.controllers.broadcaster_controller import bbb_service
+        from app.services import bbb_service as bbb_mod
+
+        assert await bbb_service.get_meeting_owner_id("meeting-123", db_session) == str(test_user.id)
+        assert "meeting-123" in bbb_mod._meeting_owners
+
+        # Ending the meeting evicts it, so a later delete isn't masked by the cache
+        await bbb_service.update_meeting_status("meeting-123", db_session, is_ended=True)
+        assert "meeting-123" not in bbb_mod._meeting_owners
+
+        await db_session.delete(test_bbb_meeting)
+        await db_session.commit()
+        assert await bbb_service.get_meeting_owner_id("meeting-123", db_session) is None
+        assert await bbb_service.get_meeting_owner_id("missing", db_session) is None
+
+    @pytest.mark.asyncio
+    async def test_deleting_owner_evicts_their_meetings(self, test_user: User):
+        from app.services import bbb_service as bbb_mod
+
+        bbb_mod._meeting_owners["m-a"] = str(test_user.id)
+        bbb_mod._meeting_owners["m-b"] = "someone-else"
+
+        bbb_mod.forget_meetings_owned_by(test_user.id)
+
+        assert "m-a" not in bbb_mod._meeting_owners
+        assert bbb_mod._meeting_owners["m-b"] == "someone-else"
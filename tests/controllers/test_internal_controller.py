@@ -0,0 +1,44 @@
+from uuid import uuid4
+
+import pytest
+from httpx import AsyncClient
+
+from app.controllers.internal_controller import SHARED_SECRET
+from app.services import connection_service as cs_mod
+
+
+@pytest.fixture(autouse=True)
+def _clear_token_cache():
+    cs_mod._token_cache.clear()
+    yield
+    cs_mod._token_cache.clear()
+
+
+class TestInternalController:
+    """Test cases for the gateway-facing internal endpoints"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("headers", [{}, {"X-Internal-Auth": "wrong"}, {"X-Internal-Auth": SHARED_SECRET + "x"}])
+    async def test_rejects_bad_secret(self, client: AsyncClient, headers):
+        response = await client.get(f"/api/internal/token/twitch/{uuid4()}", headers=headers)
+        assert response.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_token_not_found(self, client: AsyncClient):
+        response = await client.get(f"/api/internal/token/twitch/{uuid4()}", headers={"X-Internal-Auth": SHARED_SECRET})
+        assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_rejects_malformed_user_id(self, client: AsyncClient):
+        response = await client.get("/api/internal/token/twitch/not-a-uuid", headers={"X-Internal-Auth": SHARED_SECRET})
+        assert response.status_code == 422
+
+    @pytest.mark.asyncio
+    async def test_batch_tokens_omits_users_without_connection(self, client: AsyncClient):
+        response = await client.post(
+            "/api/internal/tokens",
+            json={"provider": "twitch", "user_ids": [str(uuid4()), str(uuid4())]},
+            headers={"X-Internal-Auth": SHARED_SECRET},
+        )
+        assert response.status_code == 200
+        assert response.json() == {}
@@ -47,6 +47,22 @@ async def test_get_plans_has_required_fields(client: AsyncClient):
         assert isinstance(plan["features"], list)
 
 
+@pytest.mark.anyio
+async def test_get_plans_served_from_cache(client: AsyncClient):
+    """Plans are rendered once and reused until the cache expires"""
+    from app.controllers import payment_controller
+
+    payment_controller._plans_cache.clear()
+    first = await client.get("/api/payments/plans")
+
+    with patch.object(payment_controller.PaymentService, "get_available_plans") as get_plans:
+        second = await client.get("/api/payments/plans")
+        get_plans.assert_not_called()
+
+    assert second.status_code == 200
+    assert second.json() == first.json()
+
+
 @pytest.mark.anyio
 @patch("app.services.payment_service.stripe")
 async def test_get_subscription_creates_free_for_new_user(
@@ -143,6 +159,26 @@ async def test_webhook_invalid_signature(client: AsyncClient):
     assert resp.status_code == 400
 
 
+@pytest.mark.anyio
+async def test_webhook_processing_failure_returns_500(client: AsyncClient):
+    """A failed event must not be acknowledged, so Stripe redelivers it"""
+    event = {"id": "evt_123", "type": "customer.subscription.updated", "data": {"object": {}}}
+    with (
+        patch("app.controllers.payment_controller.stripe.Webhook.construct_event", return_value=event),
+        patch(
+            "app.controllers.payment_controller.PaymentService.handle_webhook_event",
+            side_effect=RuntimeError("db down"),
+        ),
+    ):
+        resp = await client.post(
+            "/api/payments/webhook",
+            content=b"{}",
+            headers={"stripe-signature": "sig", "content-type": "application/json"},
+        )
+
+    assert resp.status_code == 500
+
+
 @pytest.mark.anyio
 async def test_get_usage_stats(client: AsyncClient, db_session, test_user: User, mock_current_user):
     """Should return usage statistics"""
@@ -169,3 +205,47 @@ async def test_get_usage_stats(client: AsyncClient, db_session, test_user: User,
         assert data["active_streams"] == 0
     finally:
         app.dependency_overrides.pop(get_current_user, None)
+
+
+@pytest.mark.anyio
+@patch("app.services.payment_service.stripe")
+async def test_get_limits_for_new_user(mock_stripe, client: AsyncClient, db_session, test_user: User, mock_current_user):
+    """Should create the free subscription and return its limits"""
+    mock_stripe.Customer.create.return_value = MagicMock(id="cus_test_fake_123")
+
+    app.dependency_overrides[get_current_user] = mock_current_user
+    try:
+        resp = await client.get("/api/payments/limits")
+        assert resp.status_code == 200
+        assert resp.json()["max_quality"] == "720p"
+        assert resp.json()["max_concurrent_streams"] == 1
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+
+
+@pytest.mark.anyio
+@patch("app.services.payment_service.stripe")
+async def test_get_limits_reuses_subscription_fetch(
+    mock_stripe, client: AsyncClient, db_session, test_user: User, mock_current_user
+):
+    """/limits right after /subscription is served without another lookup"""
+    import stripe as real_stripe
+
+    from app.controllers import payment_controller
+
+    mock_stripe.Customer.create.return_value = MagicMock(id="cus_test_fake_123")
+    mock_stripe.Subscription.list.return_value = MagicMock(data=[])
+    mock_stripe.StripeError = real_stripe.StripeError
+
+    app.dependency_overrides[get_current_user] = mock_current_user
+    try:
+        sub_resp = await client.get("/api/payments/subscription")
+        with patch.object(payment_controller.PaymentService, "get_user_subscription") as lookup:
+            resp = await client.get("/api/payments/limits")
+            lookup.assert_not_called()
+        assert resp.json() == sub_resp.json()["limits"]
+
+        payment_controller.PaymentService.invalidate_plan_limits(test_user.id)
+        assert payment_controller.PaymentService.get_cached_plan_limits(test_user.id) is None
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
@@ -1,3 +1,5 @@
+import time
+
 import httpx
 import pytest
 
@@ -139,6 +141,25 @@ async def test_validate_token_success(monkeypatch, make_service):
     assert captured.get("options", {}).get("verify_aud") is True
 
 
+async def test_validate_token_caches_payload_until_exp(monkeypatch, make_service):
+    svc, _ = make_service()
+    auth_module._token_payloads.clear()
+    calls = []
+
+    def fake_decode(token, *a, **k):
+        calls.append(token)
+        return {"preferred_username": "bob", "sub": "123", "exp": time.time() + (60 if token == "fresh" else -1)}
+
+    monkeypatch.setattr(auth_module.jwt, "decode", fake_decode)
+    first = await svc.validate_token("fresh")
+    assert await svc.validate_token("fresh") is first
+    await svc.validate_token("stale")
+    await svc.validate_token("stale")
+
+    assert calls == ["fresh", "stale", "stale"]
+    auth_module._token_payloads.clear()
+
+
 async def test_validate_token_audience_mismatch_rejected(monkeypatch, make_service):
     svc, _ = make_service()
 
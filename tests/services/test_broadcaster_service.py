@@ -1,6 +1,9 @@
 import pytest
+import requests
+from fastapi import HTTPException
 
-from app.services.broadcaster_service import StreamTracker, _clamp_resolution
+from app.services.broadcaster_service import BroadcasterService, StreamTracker, _clamp_resolution
+from app.services.stream_cleanup_service import StreamCleanupService
 
 
 class TestClampResolution:
@@ -83,3 +86,49 @@ class TestStreamTrackerFallback:
         uid, platform = await StreamTracker.remove_stream("nonexistent")
         assert uid is None
         assert platform is None
+
+    @pytest.mark.anyio
+    async def test_get_all_streams(self):
+        StreamTracker._fallback_user_streams.clear()
+        StreamTracker._fallback_stream_to_user.clear()
+        StreamTracker._fallback_stream_platforms.clear()
+
+        await StreamTracker.add_stream("user_a", "s1")
+        await StreamTracker.add_stream("user_b", "s2")
+
+        assert sorted(await StreamTracker.get_all_streams()) == ["s1", "s2"]
+
+
+class TestStreamCleanup:
+    """Test the periodic stale-stream cleanup"""
+
+    @pytest.mark.anyio
+    async def test_removes_streams_missing_from_broadcaster(self, monkeypatch):
+        StreamTracker._fallback_user_streams.clear()
+        StreamTracker._fallback_stream_to_user.clear()
+        StreamTracker._fallback_stream_platforms.clear()
+
+        await StreamTracker.add_stream("user_c", "live")
+        await StreamTracker.add_stream("user_c", "gone")
+        await StreamTracker.add_stream("user_c", "flaky")
+        await StreamTracker.add_stream("user_c", "slow")
+
+        def http_error(status_code):
+            response = requests.Response()
+            response.status_code = status_code
+            return requests.HTTPError(f"{status_code}", response=response)
+
+        async def fake_fetch_status(self, stream_id):
+            if stream_id == "gone":
+                raise http_error(404)
+            if stream_id == "flaky":
+                raise http_error(503)
+            if stream_id == "slow":
+                raise HTTPException(status_code=504, detail="timed out")
+            return {"stream_id": stream_id}
+
+        monkeypatch.setattr(BroadcasterService, "fetch_status", fake_fetch_status)
+        await StreamCleanupService.cleanup_stale_streams()
+
+        # Only a definitive 404 drops a stream; outages leave it tracked
+        assert await StreamTracker.get_user_streams("user_c") == {"live", "flaky", "slow"}
@@ -0,0 +1,35 @@
+import httpx
+import pytest
+
+from app.services.chat_gateway_client import ChatGatewayClient
+
+
+@pytest.mark.anyio
+async def test_gateway_calls_share_one_http_client():
+    client = ChatGatewayClient()
+    http = client._http_client()
+    assert client._http_client() is http
+
+    await client.close()
+    assert http.is_closed and client._http is None
+
+
+@pytest.mark.anyio
+async def test_forward_message_posts_on_the_shared_client():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append((request.url.path, request.read()))
+        return httpx.Response(202)
+
+    client = ChatGatewayClient()
+    client._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    await client.forward_message("twitch", "u1", "alice", "hi", "m1")
+
+    assert seen == [
+        (
+            "/messages/incoming",
+            b'{"platform":"twitch","user_id":"u1","user_name":"alice","content":"hi","message_id":"m1"}',
+        )
+    ]
+    await client.close()
@@ -0,0 +1,334 @@
+import asyncio
+import contextlib
+import time
+import uuid
+from datetime import timedelta
+
+import httpx
+import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.connection_model import Connection
+from app.models.user_models import User
+from app.services import connection_service as cs_mod
+from app.services.connection_service import ConnectionService
+from app.utils.datetime_utils import utcnow
+
+
+class FakeRedis:
+    """Just enough of redis.asyncio.Redis for the missing-token keys."""
+
+    def __init__(self):
+        self.store: dict[str, bytes] = {}
+
+    async def mget(self, keys):
+        return [self.store.get(k) for k in keys]
+
+    async def set(self, key, value, ex=None):
+        self.store[key] = value
+
+    async def delete(self, key):
+        self.store.pop(key, None)
+
+    @contextlib.asynccontextmanager
+    async def pipeline(self, transaction=True):
+        queued = []
+
+        class _Pipe:
+            def set(self, *args, **kwargs):
+                queued.append((args, kwargs))
+
+            async def execute(pipe):
+                for args, kwargs in queued:
+                    await self.set(*args, **kwargs)
+
+        yield _Pipe()
+
+
+@pytest.fixture(autouse=True)
+def _clear_token_cache():
+    cs_mod._token_cache.clear()
+    cs_mod._refresh_backoff.clear()
+    yield
+    cs_mod._token_cache.clear()
+    cs_mod._refresh_backoff.clear()
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    fake = FakeRedis()
+    monkeypatch.setattr(cs_mod.cache, "redis_client", fake)
+    return fake
+
+
+async def _save(db: AsyncSession, user: User, access: str = "at-1", expires_in: int = 3600):
+    return await ConnectionService.save_connection(
+        db=db,
+        user_id=user.id,
+        provider="twitch",
+        token_data={"access_token": access, "refresh_token": "rt-1", "expires_in": expires_in},
+        scopes=["chat:read"],
+    )
+
+
+@pytest.mark.anyio
+async def test_get_valid_token_is_served_from_cache(db_session: AsyncSession, test_user: User, monkeypatch):
+    await _save(db_session, test_user)
+
+    first = await ConnectionService.get_valid_token(db_session, test_user.id, "twitch")
+    assert first["access_token"] == "at-1"
+
+    async def no_db(*args, **kwargs):
+        raise AssertionError("cached token should not hit the DB")
+
+    monkeypatch.setattr(ConnectionService, "get_active_connection", no_db)
+    second = await ConnectionService.get_valid_token(db_session, test_user.id, "twitch")
+    assert second == first
+    # Callers get their own dict
+    second["access_token"] = "mutated"
+    assert (await ConnectionService.get_valid_token(db_session, test_user.id, "twitch"))["access_token"] == "at-1"
+
+
+@pytest.mark.anyio
+async def test_save_and_revoke_invalidate_cached_token(db_session: AsyncSession, test_user: User):
+    await _save(db_session, test_user)
+    await ConnectionService.get_valid_token(db_session, test_user.id, "twitch")
+
+    await _save(db_session, test_user, access="at-2")
+    assert (await ConnectionService.get_valid_token(db_session, test_user.id, "twitch"))["access_token"] == "at-2"
+
+    await ConnectionService.revoke_connection(db_session, test_user.id, "twitch")
+    assert await ConnectionService.get_valid_token(db_session, test_user.id, "twitch") is None
+
+
+@pytest.mark.anyio
+async def test_cached_token_near_expiry_goes_back_to_db(db_session: AsyncSession, test_user: User, monkeypatch):
+    # Inside the refresh threshold: the cache must not short-circuit the refresh
+    await _save(db_session, test_user, expires_in=60)
+    refreshed = []
+
+    async def fake_refresh(db, connection):
+        refreshed.append(connection.id)
+        return True
+
+    monkeypatch.setattr(ConnectionService, "refresh_connection", fake_refresh)
+    await ConnectionService.get_valid_token(db_session, test_user.id, "twitch")
+    await ConnectionService.get_valid_token(db_session, test_user.id, "twitch")
+
+    assert len(refreshed) == 2
+
+
+@pytest.mark.anyio
+async def test_get_decrypted_token_filters_by_provider_user_id(db_session: AsyncSession, test_user: User):
+    for page_id, access in (("page-1", "pt-1"), ("page-2", "pt-2")):
+        await ConnectionService.save_connection(
+            db=db_session,
+            user_id=test_user.id,
+            provider="facebook_page",
+            token_data={"access_token": access, "expires_in": 3600},
+            scopes=[],
+            provider_user_id=page_id,
+        )
+
+    token = await ConnectionService.get_decrypted_token(db_session, test_user.id, "facebook_page", provider_user_id="page-1")
+    assert token is not None and token["access_token"] == "pt-1"
+    assert (
+        await ConnectionService.get_decrypted_token(db_session, test_user.id, "facebook_page", provider_user_id="missing")
+        is None
+    )
+    assert await ConnectionService.get_decrypted_token(db_session, test_user.id, "facebook_page") is not None
+
+
+@pytest.mark.anyio
+async def test_concurrent_refreshes_collapse_to_one(db_session: AsyncSession, test_user: User, monkeypatch):
+    connection = await _save(db_session, test_user, expires_in=60)
+    calls = []
+
+    async def slow_refresh(refresh_token):
+        calls.append(refresh_token)
+        await asyncio.sleep(0.01)
+        return {"access_token": "at-new", "refresh_token": "rt-2", "expires_in": 3600}
+
+    monkeypatch.setitem(cs_mod._REFRESHERS, "twitch", slow_refresh)
+    results = await asyncio.gather(*(ConnectionService.refresh_connection(db_session, connection) for _ in range(3)))
+
+    assert results == [True, True, True]
+    assert calls == ["rt-1"]
+
+
+@pytest.mark.anyio
+async def test_refresh_rereads_a_stale_row(db_session: AsyncSession, test_user: User, monkeypatch):
+    connection = await _save(db_session, test_user, expires_in=60)
+    # Another worker refreshes the row behind this session's back
+    await db_session.execute(
+        update(Connection)
+        .where(Connection.id == connection.id)
+        .values(expires_at=utcnow() + timedelta(hours=1))
+        .execution_options(synchronize_session=False)
+    )
+    await db_session.commit()
+
+    async def no_refresh(refresh_token):
+        raise AssertionError("row was already refreshed elsewhere")
+
+    monkeypatch.setitem(cs_mod._REFRESHERS, "twitch", no_refresh)
+    assert await ConnectionService.refresh_connection(db_session, connection) is True
+    assert connection.expires_at > utcnow() + timedelta(minutes=50)
+
+
+@pytest.mark.anyio
+async def test_failed_refresh_backs_off(db_session: AsyncSession, test_user: User, monkeypatch):
+    connection = await _save(db_session, test_user, expires_in=60)
+    calls = []
+
+    async def failing_refresh(refresh_token):
+        calls.append(refresh_token)
+        raise RuntimeError("provider down")
+
+    monkeypatch.setitem(cs_mod._REFRESHERS, "twitch", failing_refresh)
+    assert await ConnectionService.refresh_connection(db_session, connection) is False
+    assert await ConnectionService.refresh_connection(db_session, connection) is False
+    assert len(calls) == 1
+
+
+@pytest.mark.anyio
+async def test_missing_token_is_remembered_until_save(db_session: AsyncSession, test_user: User, monkeypatch, fake_redis):
+    assert await ConnectionService.get_valid_token(db_session, test_user.id, "twitch") is None
+    # Shared through Redis, so every worker sees it and a save anywhere clears it
+    assert f"tokens:missing:{test_user.id}:twitch" in fake_redis.store
+
+    real_lookup = ConnectionService.get_active_connection
+    lookups = []
+
+    async def counting_lookup(*args, **kwargs):
+        lookups.append(args)
+        return await real_lookup(*args, **kwargs)
+
+    monkeypatch.setattr(ConnectionService, "get_active_connection", counting_lookup)
+    assert await ConnectionService.get_valid_token(db_session, test_user.id, "twitch") is None
+    assert lookups == []
+
+    await _save(db_session, test_user)
+    assert fake_redis.store == {}
+    token = await ConnectionService.get_valid_token(db_session, test_user.id, "twitch")
+    assert token is not None and token["access_token"] == "at-1"
+
+
+@pytest.mark.anyio
+async def test_revoke_clears_cached_token_on_every_worker(db_session: AsyncSession, test_user: User, fake_redis):
+    await _save(db_session, test_user)
+    assert (await ConnectionService.get_valid_token(db_session, test_user.id, "twitch"))["access_token"] == "at-1"
+    other_worker_entry = cs_mod._token_cache[(str(test_user.id), "twitch")]
+
+    await ConnectionService.revoke_connection(db_session, test_user.id, "twitch")
+    assert (str(test_user.id), "twitch") not in cs_mod._token_cache
+    assert f"tokens:revoked:{test_user.id}:twitch" in fake_redis.store
+
+    # A worker that cached the token before the revoke drops it on its next hit
+    cs_mod._token_cache[(str(test_user.id), "twitch")] = other_worker_entry
+    assert await ConnectionService.get_valid_token(db_session, test_user.id, "twitch") is None
+    cs_mod._token_cache[(str(test_user.id), "twitch")] = other_worker_entry
+    assert await ConnectionService.get_valid_tokens(db_session, [test_user.id], "twitch") == {}
+
+
+@pytest.mark.anyio
+async def test_missing_token_not_cached_without_redis(db_session: AsyncSession, test_user: User, monkeypatch):
+    monkeypatch.setattr(cs_mod.cache, "redis_client", None)
+    assert await ConnectionService.get_valid_token(db_session, test_user.id, "twitch") is None
+
+    # Nothing in-process can go stale: a save elsewhere is visible at once
+    await _save(db_session, test_user)
+    assert (await ConnectionService.get_valid_token(db_session, test_user.id, "twitch"))["access_token"] == "at-1"
+
+
+@pytest.mark.anyio
+async def test_concurrent_cache_misses_share_one_lookup(db_session: AsyncSession, test_user: User, monkeypatch):
+    await _save(db_session, test_user)
+    real_lookup = ConnectionService.get_active_connection
+    lookups = []
+
+    async def slow_lookup(*args, **kwargs):
+        lookups.append(args)
+        await asyncio.sleep(0.01)
+        return await real_lookup(*args, **kwargs)
+
+    monkeypatch.setattr(ConnectionService, "get_active_connection", slow_lookup)
+    tokens = await asyncio.gather(*(ConnectionService.get_valid_token(db_session, test_user.id, "twitch") for _ in range(3)))
+
+    assert [t["access_token"] for t in tokens] == ["at-1"] * 3
+    assert len(lookups) == 1
+
+
+@pytest.mark.anyio
+async def test_cached_token_near_expiry_is_refreshed_ahead(db_session: AsyncSession, test_user: User, monkeypatch):
+    # Outside the inline threshold but inside the refresh-ahead window
+    await _save(db_session, test_user, expires_in=cs_mod.REFRESH_THRESHOLD_SECONDS + 120)
+    calls = []
+
+    async def refresh(refresh_token):
+        calls.append(refresh_token)
+        return {"access_token": "at-new", "refresh_token": "rt-2", "expires_in": 3600}
+
+    @contextlib.asynccontextmanager
+    async def session_local():
+        yield db_session
+
+    monkeypatch.setitem(cs_mod._REFRESHERS, "twitch", refresh)
+    monkeypatch.setattr(cs_mod, "SessionLocal", session_local)
+
+    await ConnectionService.get_valid_token(db_session, test_user.id, "twitch")
+    served = await ConnectionService.get_valid_token(db_session, test_user.id, "twitch")
+    assert served["access_token"] == "at-1"
+
+    await asyncio.gather(*cs_mod._refresh_ahead_tasks.values())
+    assert calls == ["rt-1"]
+    assert (await ConnectionService.get_valid_token(db_session, test_user.id, "twitch"))["access_token"] == "at-new"
+
+
+@pytest.mark.anyio
+async def test_get_valid_tokens_batches_lookup(db_session: AsyncSession, test_user: User, fake_redis):
+    await _save(db_session, test_user)
+    await _save(db_session, test_user, access="at-2")
+    missing = uuid.uuid4()
+
+    tokens = await ConnectionService.get_valid_tokens(db_session, [test_user.id, missing, test_user.id], "twitch")
+
+    assert list(tokens) == [str(test_user.id)]
+    assert tokens[str(test_user.id)]["access_token"] == "at-2"
+    assert f"tokens:missing:{missing}:twitch" in fake_redis.store
+    # The batch fills the same cache the single-user path reads
+    assert (await ConnectionService.get_valid_token(db_session, test_user.id, "twitch"))["access_token"] == "at-2"
+
+
+@pytest.mark.anyio
+async def test_throttled_refresh_honors_retry_after(db_session: AsyncSession, test_user: User, monkeypatch):
+    connection = await _save(db_session, test_user, expires_in=60)
+
+    async def throttled_refresh(refresh_token):
+        request = httpx.Request("POST", "https://id.twitch.tv/oauth2/token")
+        response = httpx.Response(429, headers={"Retry-After": "600"}, request=request)
+        raise httpx.HTTPStatusError("throttled", request=request, response=response)
+
+    monkeypatch.setitem(cs_mod._REFRESHERS, "twitch", throttled_refresh)
+    assert await ConnectionService.refresh_connection(db_session, connection) is False
+
+    remaining = cs_mod._refresh_backoff[str(connection.id)] - time.monotonic()
+    assert cs_mod.REFRESH_BACKOFF_SECONDS < remaining <= 600
+
+
+@pytest.mark.anyio
+async def test_get_valid_tokens_leaves_refresh_to_single_flight(db_session: AsyncSession, test_user: User, monkeypatch):
+    await _save(db_session, test_user, expires_in=60)
+    scheduled = []
+
+    async def inline_refresh(*args, **kwargs):
+        raise AssertionError("batch lookups must not refresh inline")
+
+    monkeypatch.setattr(ConnectionService, "refresh_connection", inline_refresh)
+    monkeypatch.setattr(ConnectionService, "_schedule_refresh_ahead", lambda user_id, provider: scheduled.append(user_id))
+
+    tokens = await ConnectionService.get_valid_tokens(db_session, [test_user.id], "twitch")
+
+    assert tokens == {}
+    assert scheduled == [test_user.id]
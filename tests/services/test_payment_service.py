@@ -196,3 +196,19 @@ class TestCancelSubscription:
                 db=db_session,
             )
         assert exc_info.value.status_code == 404
+
+
+class TestReconcileCooldown:
+    """Test the per-user Stripe reconcile cooldown"""
+
+    @pytest.mark.anyio
+    async def test_reconcile_claimed_once_per_window(self, monkeypatch):
+        from app.services import payment_service
+
+        monkeypatch.setattr(payment_service.cache, "redis_client", None)
+        payment_service._recent_reconciles.clear()
+        user_id = uuid4()
+
+        assert await PaymentService.claim_reconcile(user_id) is True
+        assert await PaymentService.claim_reconcile(user_id) is False
+        assert await PaymentService.claim_reconcile(uuid4()) is True
@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services import token_refresh_service as trs
+from app.services.token_refresh_service import TokenRefreshService
+from app.utils.datetime_utils import utcnow
+
+
+class FakeScheduler:
+    def __init__(self):
+        self.jobs = {}
+
+    def add_job(self, func, trigger, id, **kwargs):
+        self.jobs[id] = trigger.run_date.replace(tzinfo=None)
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    fake = FakeScheduler()
+    monkeypatch.setattr(TokenRefreshService, "_scheduler", None)
+    monkeypatch.setattr(TokenRefreshService, "_next_refresh_at", None)
+    monkeypatch.setattr(TokenRefreshService, "_failures", 0)
+    TokenRefreshService.start(fake)
+    return fake
+
+
+def test_next_refresh_at_sleeps_until_refresh_window():
+    now = datetime(2026, 6, 1, 12, 0)
+    four_hours = now + timedelta(hours=4)
+    assert TokenRefreshService.next_refresh_at(four_hours, now) == now + timedelta(hours=3, minutes=30)
+    # Already inside the window -> minimum sleep, never a busy loop
+    assert TokenRefreshService.next_refresh_at(now, now) == now + timedelta(seconds=trs.MIN_REFRESH_SLEEP_SECONDS)
+    # Nothing to refresh -> maximum sleep
+    assert TokenRefreshService.next_refresh_at(None, now) == now + timedelta(seconds=trs.MAX_REFRESH_SLEEP_SECONDS)
+
+
+def test_bring_forward_only_moves_the_next_run_earlier(scheduler):
+    TokenRefreshService._schedule(utcnow() + timedelta(hours=5))
+
+    TokenRefreshService.bring_forward(utcnow() + timedelta(days=60))
+    assert scheduler.jobs[trs.TOKEN_REFRESH_JOB_ID] > utcnow() + timedelta(hours=4)
+
+    TokenRefreshService.bring_forward(utcnow() + timedelta(hours=1))
+    assert scheduler.jobs[trs.TOKEN_REFRESH_JOB_ID] < utcnow() + timedelta(minutes=31)
+
+
+def test_retry_delay_grows_with_jitter_up_to_the_cap():
+    assert trs.RETRY_BASE_SECONDS <= TokenRefreshService.retry_delay(1) <= trs.RETRY_BASE_SECONDS * 1.5
+    assert 4 * trs.RETRY_BASE_SECONDS <= TokenRefreshService.retry_delay(3) <= 6 * trs.RETRY_BASE_SECONDS
+    assert trs.RETRY_MAX_SECONDS <= TokenRefreshService.retry_delay(50) <= trs.RETRY_MAX_SECONDS * 1.5
+
+
+@pytest.mark.anyio
+async def test_failed_pass_backs_off_and_success_resets(scheduler, monkeypatch):
+    async def failing(db):
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(TokenRefreshService, "refresh_expiring_tokens", staticmethod(failing))
+    await TokenRefreshService.run()
+    await TokenRefreshService.run()
+    assert TokenRefreshService._failures == 2
+    assert scheduler.jobs[trs.TOKEN_REFRESH_JOB_ID] > utcnow() + timedelta(seconds=2 * trs.RETRY_BASE_SECONDS - 5)
+
+    async def ok(db):
+        return None
+
+    monkeypatch.setattr(TokenRefreshService, "refresh_expiring_tokens", staticmethod(ok))
+    await TokenRefreshService.run()
+    assert TokenRefreshService._failures == 0
+
+
+@pytest.mark.anyio
+async def test_refresh_expiring_tokens_returns_earliest_remaining_expiry(db_session, test_user):
+    from app.services.connection_service import ConnectionService
+
+    for provider, expires_in in (("twitch", 4 * 3600), ("youtube", 3600)):
+        await ConnectionService.save_connection(
+            db=db_session,
+            user_id=test_user.id,
+            provider=provider,
+            token_data={"access_token": "a", "refresh_token": "r", "expires_in": expires_in},
+            scopes=[],
+        )
+
+    earliest = await TokenRefreshService.refresh_expiring_tokens(db_session)
+
+    assert earliest is not None
+    assert timedelta(minutes=55) < earliest - utcnow() <= timedelta(hours=1)
+
+
+@pytest.mark.anyio
+async def test_failing_connection_does_not_pin_the_next_run(db_session, test_user, monkeypatch):
+    from app.services import connection_service as cs_mod
+    from app.services.connection_service import ConnectionService
+
+    for provider, expires_in in (("twitch", -60), ("youtube", 4 * 3600)):
+        await ConnectionService.save_connection(
+            db=db_session,
+            user_id=test_user.id,
+            provider=provider,
+            token_data={"access_token": "a", "refresh_token": "r", "expires_in": expires_in},
+            scopes=[],
+        )
+
+    async def dead_refresh(refresh_token):
+        raise RuntimeError("invalid_grant")
+
+    monkeypatch.setitem(cs_mod._REFRESHERS, "twitch", dead_refresh)
+    cs_mod._refresh_backoff.clear()
+
+    earliest = await TokenRefreshService.refresh_expiring_tokens(db_session)
+    cs_mod._refresh_backoff.clear()
+
+    # The dead twitch token is ignored; the healthy youtube one sets the pace
+    assert earliest is not None
+    assert earliest - utcnow() > timedelta(hours=3)
+    assert TokenRefreshService.next_refresh_at(earliest, utcnow()) > utcnow() + timedelta(hours=3)